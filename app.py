@@ -4,20 +4,29 @@ Provides REST API and WebSocket support for real-time updates.
 """
 
 import asyncio
-import json
+import atexit
+import functools
+import hashlib
 import logging
+import logging.handlers
+import mimetypes
 import os
+import queue
 import sys
 import threading
 import time
-from typing import Any, Dict
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator
 
+import orjson
 import yaml
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 
-from settings import load_settings, save_settings, DEFAULT_SETTINGS
+from settings import load_settings, save_settings, settings_version, DEFAULT_SETTINGS, YAMLLoader, YAMLDumper
 from memory import load_memory
 
 log = logging.getLogger("ChatPalBrain")
@@ -33,10 +42,76 @@ else:
     # Running as normal Python script
     static_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend', 'build')
 
+# sounddevice reports sample rates and channel counts as numpy scalars
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively."""
+    if isinstance(obj, (deque, set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode an object to JSON bytes with the app-wide orjson options."""
+    return orjson.dumps(obj, default=_orjson_default, option=ORJSON_OPTIONS)
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson for all jsonify() responses."""
+    
+    mimetype = 'application/json'
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return _dumps(obj).decode('utf-8')
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        # Hand the encoded bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(_dumps(obj), mimetype=self.mimetype)
+
+
+class SocketIOJSON:
+    """
+    orjson adapter for python-socketio packet encoding.
+    
+    Socket.IO calls dumps() with stdlib keyword arguments (e.g. separators)
+    and expects a str back, so orjson cannot be passed in directly.
+    """
+    
+    @staticmethod
+    def dumps(obj: Any, *args: Any, **kwargs: Any) -> str:
+        return _dumps(obj).decode('utf-8')
+    
+    @staticmethod
+    def loads(s: Any, *args: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+# DEFAULT_SETTINGS is constant for the life of the process, so encode it once
+_DEFAULTS_BODY = _dumps({'success': True, 'data': DEFAULT_SETTINGS})
+_DEFAULTS_ETAG = hashlib.blake2b(_DEFAULTS_BODY, digest_size=8).hexdigest()
+
+
 # Flask app setup
 app = Flask(__name__, static_folder=static_folder, static_url_path=None)
+app.json = OrjsonProvider(app)
 CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+# Stays on threading: the bot runs its own asyncio loop in a thread, which
+# eventlet/gevent monkey-patching would break. Payloads above the threshold
+# (log batches, status snapshots) are compressed.
+SOCKETIO_COMPRESSION_THRESHOLD = 512
+socketio = SocketIO(
+    app,
+    cors_allowed_origins="*",
+    async_mode='threading',
+    json=SocketIOJSON,
+    compression_threshold=SOCKETIO_COMPRESSION_THRESHOLD,
+)
 
 # Global state
 app_state = {
@@ -53,38 +128,299 @@ app_state = {
         'followers': 0
     },
     'mic_level': 0.0,
-    'logs': []
+    'logs': deque(maxlen=1000)  # Oldest entries are evicted automatically
 }
 
+# app_state is written from the log listener, request handlers and the bot
+# thread; every write and every read that serializes it holds this lock
+_state_lock = threading.Lock()
+
 main_thread = None
 micmon_ref = None
 
+# Vite emits content-hashed bundles under assets/, which are safe to cache for a year
+IMMUTABLE_ASSET_PREFIX = 'assets/'
+IMMUTABLE_ASSET_MAX_AGE = 31536000
+# Precompressed siblings written by frontend/scripts/precompress.js, in order of preference
+PRECOMPRESSED_VARIANTS = (('br', '.br'), ('gzip', '.gz'))
+
+# Legacy memory file contents keyed by (path, mtime_ns, size, decay_days)
+_memory_cache: Dict[str, Any] = {'key': None, 'memory': None}
+
+# PortAudio device enumeration is slow; reuse it for DEVICE_CACHE_TTL seconds
+DEVICE_CACHE_TTL = 30.0
+_device_cache: Dict[str, Any] = {'ts': 0.0, 'devices': None}
+
+# Serialized non-log part of /api/status as (state version, bytes); writers bump the
+# version. Logs change on every record, so they are encoded per request instead.
+_status_cache: Dict[str, Any] = {'version': 0, 'snapshot': (-1, b'')}
+
+# Mic level updates arrive per audio block; clients get the window peak every 100 ms
+MIC_LEVEL_EMIT_INTERVAL = 0.1
+_mic_window: Dict[str, Any] = {'peak': 0.0, 'dirty': False, 'started': False}
+_mic_lock = threading.Lock()
+
+# Persona endpoints share one engine/store, rebuilt when settings.yaml changes
+_persona_cache: Dict[str, Any] = {'engine': None, 'store': None, 'version': None}
+_persona_lock = threading.Lock()
+
+
+@dataclass
+class LogEntry:
+    """Log line sent to web clients; orjson encodes dataclasses without an intermediate dict."""
+    
+    __slots__ = ('timestamp', 'level', 'message')
+    timestamp: float
+    level: str
+    message: str
+
 
 class WebSocketHandler(logging.Handler):
-    """Custom logging handler that broadcasts to WebSocket clients."""
+    """
+    Custom logging handler that broadcasts to WebSocket clients.
+    
+    Records are queued and sent as one 'log_batch' event per flush interval
+    instead of one Socket.IO emit per record.
+    """
+    
+    FLUSH_INTERVAL = 0.05
+    MAX_BATCH = 200
+    
+    def __init__(self) -> None:
+        super().__init__()
+        self._pending: "queue.Queue[LogEntry]" = queue.Queue()
+        self._flusher_started = False
+        self._flusher_lock = threading.Lock()
     
     def emit(self, record):
         try:
-            msg = self.format(record)
-            log_entry = {
-                'timestamp': time.time(),
-                'level': record.levelname,
-                'message': msg
-            }
-            app_state['logs'].append(log_entry)
-            # Keep only last 1000 logs
-            if len(app_state['logs']) > 1000:
-                app_state['logs'] = app_state['logs'][-1000:]
+            log_entry = LogEntry(time.time(), record.levelname, self.format(record))
+            with _state_lock:
+                app_state['logs'].append(log_entry)
             
-            socketio.emit('log', log_entry)
+            self._pending.put(log_entry)
+            self._ensure_flusher()
         except Exception:
             pass
+    
+    def _ensure_flusher(self) -> None:
+        """Start the background flush task on first use."""
+        if self._flusher_started:
+            return
+        with self._flusher_lock:
+            if not self._flusher_started:
+                self._flusher_started = True
+                socketio.start_background_task(self._flush_loop)
+    
+    def _flush_loop(self) -> None:
+        """Periodically drain queued log entries and emit them as a batch."""
+        while True:
+            socketio.sleep(self.FLUSH_INTERVAL)
+            batch = []
+            try:
+                while len(batch) < self.MAX_BATCH:
+                    batch.append(self._pending.get_nowait())
+            except queue.Empty:
+                pass
+            if batch:
+                try:
+                    socketio.emit('log_batch', batch)
+                except Exception:
+                    pass
 
 
 # Setup WebSocket logging
+# The root logger only enqueues records; formatting and broadcasting happen on
+# the listener thread so request handlers and the bot loop never wait on it.
 ws_handler = WebSocketHandler()
 ws_handler.setFormatter(logging.Formatter('%(asctime)s | %(levelname)s | %(message)s'))
-logging.getLogger().addHandler(ws_handler)
+log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(log_queue, ws_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+
+def _invalidate_status() -> None:
+    """Mark the cached /api/status body stale after app_state changed (caller holds _state_lock)."""
+    _status_cache['version'] += 1
+
+
+def _state_snapshot() -> Dict[str, Any]:
+    """
+    Copy app_state so it can be serialized without holding _state_lock.
+    
+    Returns:
+        Copy of app_state with nested containers copied one level deep
+    """
+    with _state_lock:
+        return {
+            key: list(value) if isinstance(value, deque) else dict(value) if isinstance(value, dict) else value
+            for key, value in app_state.items()
+        }
+
+
+@functools.lru_cache(maxsize=4096)
+def _static_exists(static_dir: str, path: str) -> bool:
+    """
+    Check whether a file exists in the frontend build directory.
+    
+    The build output does not change while the server runs, so results are
+    memoized per (directory, path).
+    
+    Args:
+        static_dir: Static folder of the app
+        path: Requested path relative to static_dir
+    
+    Returns:
+        True if the path is a regular file
+    """
+    return os.path.isfile(os.path.join(static_dir, path))
+
+
+def _send_static(path: str):
+    """
+    Send a frontend build file, preferring a precompressed variant the client accepts.
+    
+    Args:
+        path: File path relative to the static folder
+    
+    Returns:
+        Flask response (304 when the client's cached copy is still valid)
+    """
+    static_dir = app.static_folder
+    max_age = IMMUTABLE_ASSET_MAX_AGE if path.startswith(IMMUTABLE_ASSET_PREFIX) else None
+    
+    for encoding, suffix in PRECOMPRESSED_VARIANTS:
+        if encoding in request.accept_encodings and _static_exists(static_dir, path + suffix):
+            mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            response = send_from_directory(
+                static_dir, path + suffix, mimetype=mimetype, max_age=max_age, conditional=True
+            )
+            response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+            return response
+    
+    return send_from_directory(static_dir, path, max_age=max_age, conditional=True)
+
+
+def _yaml_chunks(cfg: Dict[str, Any]) -> Iterator[bytes]:
+    """
+    Encode settings as YAML one top-level section at a time.
+    
+    The concatenated chunks are identical to a single yaml.dump() of cfg.
+    
+    Args:
+        cfg: Configuration dictionary
+    
+    Yields:
+        UTF-8 encoded YAML for each top-level key
+    """
+    for key in sorted(cfg):
+        yield yaml.dump(
+            {key: cfg[key]}, Dumper=YAMLDumper, default_flow_style=False, allow_unicode=True
+        ).encode('utf-8')
+
+
+def _load_memory_cached(path: str, decay_days: int) -> Dict[str, Any]:
+    """
+    Load the legacy memory file, re-reading it only when it changes on disk.
+    
+    Args:
+        path: Path to memory file
+        decay_days: Number of days after which user data is considered stale
+    
+    Returns:
+        Dictionary containing user memory data
+    """
+    try:
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_mtime_ns, st.st_size, decay_days)
+    except OSError:
+        key = None
+    
+    if key is not None and key == _memory_cache['key']:
+        return _memory_cache['memory']
+    
+    memory = load_memory(path, decay_days)
+    _memory_cache['key'] = key
+    _memory_cache['memory'] = memory
+    return memory
+
+
+def _query_devices_cached(refresh: bool = False) -> list:
+    """
+    Get the sounddevice device list, re-querying PortAudio at most every DEVICE_CACHE_TTL seconds.
+    
+    Args:
+        refresh: Force a fresh query
+    
+    Returns:
+        List of device info dictionaries
+    """
+    now = time.monotonic()
+    if refresh or _device_cache['devices'] is None or now - _device_cache['ts'] > DEVICE_CACHE_TTL:
+        import sounddevice as sd
+        _device_cache['devices'] = list(sd.query_devices())
+        _device_cache['ts'] = now
+    return _device_cache['devices']
+
+
+def _persona_cache_for(cfg_version: Any) -> Dict[str, Any]:
+    """
+    Get the persona cache, dropping its contents if settings changed (caller holds _persona_lock).
+    
+    Args:
+        cfg_version: Current settings_version() value
+    
+    Returns:
+        The cache dictionary holding 'engine' and 'store'
+    """
+    if cfg_version is None or cfg_version != _persona_cache['version']:
+        _persona_cache['engine'] = None
+        _persona_cache['store'] = None
+        _persona_cache['version'] = cfg_version
+    return _persona_cache
+
+
+def _get_persona_engine(cfg: Dict[str, Any]):
+    """
+    Get the shared ResponseEngine used by the persona endpoints.
+    
+    Args:
+        cfg: Configuration dictionary
+    
+    Returns:
+        ResponseEngine instance, rebuilt only after settings change
+    """
+    with _persona_lock:
+        cache = _persona_cache_for(settings_version())
+        if cache['engine'] is None:
+            from response import ResponseEngine
+            mem_cfg = cfg.get("memory", {})
+            memory = _load_memory_cached(mem_cfg.get("file", "memory.json"), mem_cfg.get("decay_days", 90))
+            cache['engine'] = ResponseEngine(cfg, memory)
+        return cache['engine']
+
+
+def _get_persona_store(cfg: Dict[str, Any]):
+    """
+    Get the shared PersonaStateStore used by the persona update endpoint.
+    
+    Args:
+        cfg: Configuration dictionary
+    
+    Returns:
+        PersonaStateStore instance, rebuilt only after settings change
+    """
+    with _persona_lock:
+        cache = _persona_cache_for(settings_version())
+        if cache['store'] is None:
+            from modules.persona_state import PersonaStateStore
+            personality_config = cfg.get("personality_bias", {})
+            db_path = personality_config.get("persistence", {}).get("db_path", "./persona_state.db")
+            cache['store'] = PersonaStateStore(personality_config, db_path)
+        return cache['store']
 
 
 # API Routes
@@ -97,17 +433,15 @@ def serve(path):
     # This is intentional - paths like '/user/api/data' are valid SPA routes.
     # Actual API routes (e.g., /api/settings) have explicit Flask route handlers
     # that take precedence over this catch-all route.
-    if path.startswith('api/') or path.startswith('socket.io/'):
+    if path.startswith(('api/', 'socket.io/')):
         return jsonify({'error': 'Not found'}), 404
     
     # Serve static files directly if they exist
-    if path and app.static_folder:
-        file_path = os.path.join(app.static_folder, path)
-        if os.path.isfile(file_path):
-            return send_from_directory(app.static_folder, path)
+    if path and app.static_folder and _static_exists(app.static_folder, path):
+        return _send_static(path)
     
     # Everything else -> index.html (React Router handles it)
-    return send_from_directory(app.static_folder, 'index.html')
+    return _send_static('index.html')
 
 
 @app.route('/api/settings', methods=['GET'])
@@ -142,11 +476,11 @@ def export_settings():
         format_type = request.args.get('format', 'json').lower()
         
         if format_type == 'yaml':
-            content = yaml.dump(cfg, default_flow_style=False, allow_unicode=True)
-            return content, 200, {'Content-Type': 'application/x-yaml', 
-                                 'Content-Disposition': 'attachment; filename=settings.yaml'}
+            return Response(_yaml_chunks(cfg), mimetype='application/x-yaml',
+                            headers={'Content-Disposition': 'attachment; filename=settings.yaml'})
         else:
-            return jsonify(cfg), 200, {'Content-Disposition': 'attachment; filename=settings.json'}
+            return Response(_dumps(cfg), mimetype='application/json',
+                            headers={'Content-Disposition': 'attachment; filename=settings.json'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -162,15 +496,16 @@ def import_settings():
         if file.filename == '':
             return jsonify({'success': False, 'error': 'No file selected'}), 400
         
-        content = file.read().decode('utf-8')
+        # Keep the upload as bytes; both parsers detect the encoding themselves
+        content = file.read()
         
         # Try to parse as YAML first, then JSON
         try:
-            cfg = yaml.safe_load(content)
+            cfg = yaml.load(content, Loader=YAMLLoader)  # nosec B506 - safe loader
         except yaml.YAMLError:
             try:
-                cfg = json.loads(content)
-            except json.JSONDecodeError:
+                cfg = orjson.loads(content)
+            except orjson.JSONDecodeError:
                 return jsonify({'success': False, 'error': 'Invalid file format'}), 400
         
         save_settings(cfg)
@@ -182,7 +517,18 @@ def import_settings():
 @app.route('/api/status', methods=['GET'])
 def get_status():
     """Get current application status."""
-    return jsonify({'success': True, 'data': app_state})
+    with _state_lock:
+        version = _status_cache['version']
+        built_version, head = _status_cache['snapshot']
+        if built_version != version:
+            # '{"success":true,"data":{...' without the closing braces, logs go last
+            state = {key: value for key, value in app_state.items() if key != 'logs'}
+            head = _dumps({'success': True, 'data': state})[:-2]
+            _status_cache['snapshot'] = (version, head)
+        logs = list(app_state['logs'])
+    # The log buffer is encoded outside the lock so the log handler never waits on it
+    body = b''.join((head, b',"logs":', _dumps(logs), b'}}'))
+    return app.response_class(body, mimetype='application/json')
 
 
 @app.route('/api/start', methods=['POST'])
@@ -198,13 +544,16 @@ def start_app():
         
         # Start main application in background thread
         def run_main():
-            from main import start_all
-            asyncio.run(start_all(cfg, None))
+            from main import install_event_loop_policy, start_all
+            install_event_loop_policy()
+            asyncio.run(start_all(cfg, None, level_cb=broadcast_mic_level))
         
         main_thread = threading.Thread(target=run_main, daemon=True)
         main_thread.start()
         
-        app_state['running'] = True
+        with _state_lock:
+            app_state['running'] = True
+            _invalidate_status()
         socketio.emit('status_change', {'running': True})
         
         return jsonify({'success': True, 'message': 'Application started'})
@@ -216,7 +565,9 @@ def start_app():
 def stop_app():
     """Stop the TikTok bot."""
     try:
-        app_state['running'] = False
+        with _state_lock:
+            app_state['running'] = False
+            _invalidate_status()
         socketio.emit('status_change', {'running': False})
         return jsonify({'success': True, 'message': 'Application stopped'})
     except Exception as e:
@@ -229,7 +580,7 @@ def get_memory():
     try:
         cfg = load_settings()
         mem_cfg = cfg.get('memory', {})
-        memory = load_memory(mem_cfg.get('file', 'memory.json'), mem_cfg.get('decay_days', 90))
+        memory = _load_memory_cached(mem_cfg.get('file', 'memory.json'), mem_cfg.get('decay_days', 90))
         
         stats = {
             'total_users': len(memory.get('users', {})),
@@ -246,8 +597,7 @@ def get_memory():
 def get_audio_devices():
     """Get available audio input devices."""
     try:
-        import sounddevice as sd
-        devices = sd.query_devices()
+        devices = _query_devices_cached()
         input_devs = [
             {'id': i, 'name': d['name'], 'channels': int(d.get('max_input_channels', 0))}
             for i, d in enumerate(devices)
@@ -258,20 +608,32 @@ def get_audio_devices():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/devices/refresh', methods=['POST'])
+def refresh_audio_devices():
+    """Re-enumerate audio devices, e.g. after plugging in a microphone."""
+    try:
+        devices = _query_devices_cached(refresh=True)
+        return jsonify({'success': True, 'message': f'Found {len(devices)} audio devices'})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/defaults', methods=['GET'])
 def get_defaults():
     """Get default settings."""
-    return jsonify({'success': True, 'data': DEFAULT_SETTINGS})
+    response = app.response_class(_DEFAULTS_BODY, mimetype='application/json')
+    response.set_etag(_DEFAULTS_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    return response.make_conditional(request)
 
 
 @app.route('/api/persona/state', methods=['GET'])
 def get_persona_state():
     """Get current persona state."""
     try:
-        from response import ResponseEngine
         cfg = load_settings()
-        memory = load_memory(cfg.get("memory", {}).get("file", "memory.json"))
-        engine = ResponseEngine(cfg, memory)
+        engine = _get_persona_engine(cfg)
         
         scope_id = request.args.get('scope_id', 'session')
         state = engine.get_persona_state(scope_id)
@@ -292,10 +654,8 @@ def get_persona_state():
 def reset_persona():
     """Reset persona state to defaults."""
     try:
-        from response import ResponseEngine
         cfg = load_settings()
-        memory = load_memory(cfg.get("memory", {}).get("file", "memory.json"))
-        engine = ResponseEngine(cfg, memory)
+        engine = _get_persona_engine(cfg)
         
         data = request.get_json() or {}
         scope_id = data.get('scope_id', 'session')
@@ -318,7 +678,6 @@ def reset_persona():
 def update_persona():
     """Update persona tone weights or stance overrides."""
     try:
-        from modules.persona_state import PersonaStateStore
         cfg = load_settings()
         personality_config = cfg.get("personality_bias", {})
         
@@ -328,8 +687,7 @@ def update_persona():
                 'error': 'Personality system not enabled'
             }), 400
         
-        db_path = personality_config.get("persistence", {}).get("db_path", "./persona_state.db")
-        store = PersonaStateStore(personality_config, db_path)
+        store = _get_persona_store(cfg)
         
         data = request.get_json()
         if not data:
@@ -363,7 +721,7 @@ def update_persona():
 def handle_connect():
     """Handle WebSocket connection."""
     log.info('Client connected')
-    emit('status', app_state)
+    emit('status', _state_snapshot())
 
 
 @socketio.on('disconnect')
@@ -375,25 +733,64 @@ def handle_disconnect():
 @socketio.on('request_status')
 def handle_status_request():
     """Handle status request."""
-    emit('status', app_state)
+    emit('status', _state_snapshot())
 
 
 def broadcast_mic_level(level):
-    """Broadcast microphone level to all clients."""
-    app_state['mic_level'] = level
-    socketio.emit('mic_level', {'level': level})
+    """
+    Record a microphone level from the audio thread.
+    
+    Levels are coalesced to their window peak, which a background task
+    emits every MIC_LEVEL_EMIT_INTERVAL, so the last window is sent even
+    after updates stop.
+    """
+    with _mic_lock:
+        # Track the peak so short spikes between emits are not lost
+        if not _mic_window['dirty'] or level > _mic_window['peak']:
+            _mic_window['peak'] = level
+        _mic_window['dirty'] = True
+        start = not _mic_window['started']
+        _mic_window['started'] = True
+    if start:
+        socketio.start_background_task(_mic_level_loop)
+
+
+def _emit_mic_peak() -> None:
+    """Emit the peak of the current mic level window, if any level arrived in it."""
+    with _mic_lock:
+        if not _mic_window['dirty']:
+            return
+        peak = _mic_window['peak']
+        _mic_window['dirty'] = False
+    
+    with _state_lock:
+        app_state['mic_level'] = peak
+        _invalidate_status()
+    socketio.emit('mic_level', {'level': peak})
+
+
+def _mic_level_loop() -> None:
+    """Background task that flushes mic level windows."""
+    while True:
+        socketio.sleep(MIC_LEVEL_EMIT_INTERVAL)
+        _emit_mic_peak()
 
 
 def broadcast_connection_status(service, connected):
     """Broadcast connection status change."""
-    app_state['connected'][service] = connected
+    with _state_lock:
+        app_state['connected'][service] = connected
+        _invalidate_status()
     socketio.emit('connection_status', {'service': service, 'connected': connected})
 
 
 def broadcast_stats_update(stats):
     """Broadcast statistics update."""
-    app_state['stats'].update(stats)
-    socketio.emit('stats', app_state['stats'])
+    with _state_lock:
+        app_state['stats'].update(stats)
+        _invalidate_status()
+        snapshot = dict(app_state['stats'])
+    socketio.emit('stats', snapshot)
 
 
 def main():
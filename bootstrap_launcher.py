@@ -10,45 +10,234 @@ This is a GUI-based launcher/installer that:
 - Optionally launches the main application
 """
 
+import atexit
+import io
 import os
 import sys
 import hashlib
+import mmap
+import concurrent.futures
 import shutil
 import subprocess
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox
 from datetime import datetime
 import traceback
 import tempfile
+import zipfile
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
 
 
 # Version info
 LAUNCHER_VERSION = "1.0.0"
+_PY_VERSION = sys.version
+_PLATFORM = sys.platform
 DEFAULT_INSTALL_PATH = os.path.join(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')), 'PalFriend')
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB per read keeps per-call overhead negligible
+LOG_FILE_BUFFER_SIZE = 64 * 1024
+MMAP_HASH_LIMIT = 1 << 31  # larger files are streamed instead of mapped
+MMAP_PROGRESS_STEP = 16 << 20  # mapped files report progress every 16 MiB
+PAYLOAD_COPY_BUFFER_SIZE = 1 << 20
+LOG_VIEW_MAX_LINES = 500  # the full log stays available via Copy Diagnostics
+PAYLOAD_NAMES = ('palfriend_payload', 'palfriend_payload.zip')
+
+
+def sha256_file(file_path, progress=None):
+    """
+    Return the hex SHA256 digest of a file.
+    
+    If progress is given it is called with the byte count of every block hashed.
+    """
+    # Unbuffered so each read lands directly in the hash buffer
+    with open(file_path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if 0 < size < MMAP_HASH_LIMIT:
+            # Hash the mapped file without copying it into Python buffers; large
+            # zero-copy slices keep the GIL released and still allow coarse progress
+            sha256_hash = hashlib.sha256()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                step = MMAP_PROGRESS_STEP if progress is not None else size
+                for start in range(0, size, step):
+                    block = view[start:start + step]
+                    sha256_hash.update(block)
+                    if progress is not None:
+                        progress(len(block))
+                    block.release()
+            return sha256_hash.hexdigest()
+        
+        sha256_hash = hashlib.sha256()
+        buf = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(view)
+            if not n:
+                break
+            sha256_hash.update(view[:n])
+            if progress is not None:
+                progress(n)
+        return sha256_hash.hexdigest()
+
+
+def _payload_dest(dest_root, name):
+    """Resolve a payload member below dest_root, refusing paths that escape it"""
+    dest = os.path.realpath(os.path.join(dest_root, name))
+    if os.path.commonpath([dest_root, dest]) != dest_root:
+        raise ValueError(f"Unsafe path in payload: {name}")
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    return dest
+
+
+def extract_payload(payload_path, dest_dir, progress=None):
+    """
+    Copy a bundled payload directory or zip archive into dest_dir.
+    
+    If progress is given it is called with the running file count after
+    every file written. Returns the number of files written.
+    """
+    dest_root = os.path.realpath(dest_dir)
+    count = 0
+    
+    if zipfile.is_zipfile(payload_path):
+        with zipfile.ZipFile(payload_path) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                dest = _payload_dest(dest_root, info.filename)
+                if info.file_size == 0:
+                    # Nothing to decompress
+                    open(dest, 'wb').close()
+                else:
+                    with zf.open(info) as src, open(dest, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, PAYLOAD_COPY_BUFFER_SIZE)
+                count += 1
+                if progress is not None:
+                    progress(count)
+        return count
+    
+    for root, _dirs, files in os.walk(payload_path):
+        for name in files:
+            src_file = os.path.join(root, name)
+            dest = _payload_dest(dest_root, os.path.relpath(src_file, payload_path))
+            # copyfile uses the OS fast-copy path where available
+            shutil.copyfile(src_file, dest)
+            count += 1
+            if progress is not None:
+                progress(count)
+    return count
+
+
+@dataclass
+class _InstallDirInfo:
+    """Filesystem facts about the install directory, gathered once per install attempt"""
+    path: str
+    exists: bool
+    free_bytes: Optional[int] = None
+    disk_error: Optional[str] = None
+
+
+def probe_install_dir(path):
+    """Stat the install directory and query its free space once"""
+    try:
+        os.stat(path)
+    except FileNotFoundError:
+        return _InstallDirInfo(path=path, exists=False, disk_error="directory does not exist yet")
+    except OSError as e:
+        return _InstallDirInfo(path=path, exists=False, disk_error=str(e))
+    
+    try:
+        return _InstallDirInfo(path=path, exists=True, free_bytes=shutil.disk_usage(path).free)
+    except OSError as e:
+        return _InstallDirInfo(path=path, exists=True, disk_error=str(e))
 
 
 class DiagnosticsLogger:
     """Logger that captures diagnostics for export"""
     
+    FLUSH_INTERVAL = 0.1  # seconds between background writes to the log file
+    
     def __init__(self):
         self.messages = []
         self.log_file = None
+        self._fh = None
+        # Formatted timestamp of the current second, reused for bursts of messages
+        self._ts_sec = -1
+        self._ts_str = ""
+        # Lines waiting for the background flusher; deque appends need no lock
+        self._pending = deque()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher = None
+        self._closed = False
         
     def log(self, level, message):
         """Add a log message"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] {level}: {message}"
+        sec = int(time.time())
+        if sec != self._ts_sec:
+            self._ts_sec = sec
+            self._ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+        log_entry = f"[{self._ts_str}] {level}: {message}"
         self.messages.append(log_entry)
         
-        # Also write to file if available
-        if self.log_file:
+        # Also write to file if available; the flusher thread does the disk I/O
+        if self.log_file and not self._closed:
+            self._pending.append(log_entry + '\n')
+            if self._flusher is None:
+                self._start_flusher()
+            if level == "ERROR":
+                self._wake.set()
+                
+        return log_entry
+    
+    def _start_flusher(self):
+        """Start the background thread that writes pending lines to disk"""
+        self._flusher = threading.Thread(target=self._flush_loop, name="launcher-log-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+    
+    def _flush_loop(self):
+        """Write pending lines every FLUSH_INTERVAL, or immediately after an error"""
+        while not self._closed:
+            self._wake.wait(self.FLUSH_INTERVAL)
+            self._wake.clear()
+            self.flush()
+    
+    def flush(self):
+        """Write pending log lines to the log file"""
+        with self._io_lock:
+            batch = []
+            while True:
+                try:
+                    batch.append(self._pending.popleft())
+                except IndexError:
+                    break
+            if not batch:
+                return
             try:
-                with open(self.log_file, 'a', encoding='utf-8') as f:
-                    f.write(log_entry + '\n')
+                if self._fh is None:
+                    self._fh = open(self.log_file, 'a', encoding='utf-8', buffering=LOG_FILE_BUFFER_SIZE)
+                self._fh.write(''.join(batch))
+                self._fh.flush()
             except Exception:
                 pass
-                
-        return log_entry
+    
+    def close(self):
+        """Stop the flusher, write remaining lines and close the log file"""
+        self._closed = True
+        self._wake.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=1.0)
+        self.flush()
+        with self._io_lock:
+            if self._fh is not None:
+                try:
+                    self._fh.close()
+                except Exception:
+                    pass
+                self._fh = None
     
     def info(self, message):
         return self.log("INFO", message)
@@ -77,6 +266,9 @@ class PalFriendLauncherGUI:
         self.install_path = tk.StringVar(value=DEFAULT_INSTALL_PATH)
         self.logger = DiagnosticsLogger()
         self.palfriend_exe_path = None
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self._pending_lines = []
+        self._flush_scheduled = False
         
         # Setup logging to file
         try:
@@ -88,8 +280,8 @@ class PalFriendLauncherGUI:
         
         self.setup_ui()
         self.logger.info("PalFriend Launcher started")
-        self.logger.info(f"Python version: {sys.version}")
-        self.logger.info(f"Platform: {sys.platform}")
+        self.logger.info(f"Python version: {_PY_VERSION}")
+        self.logger.info(f"Platform: {_PLATFORM}")
         
     def setup_ui(self):
         """Setup the user interface"""
@@ -200,11 +392,27 @@ class PalFriendLauncherGUI:
     def log_to_ui(self, message, level="INFO"):
         """Add message to UI log"""
         log_entry = self.logger.log(level, message)
+        self._pending_lines.append(log_entry + '\n')
+        if not self._flush_scheduled:
+            # Lines logged before Tk goes idle are written to the widget in one go
+            self._flush_scheduled = True
+            self.root.after_idle(self._flush_log)
+    
+    def _flush_log(self):
+        """Write pending log lines to the UI log"""
+        self._flush_scheduled = False
+        if not self._pending_lines:
+            return
+        text = ''.join(self._pending_lines)
+        self._pending_lines.clear()
         self.log_text.config(state='normal')
-        self.log_text.insert('end', log_entry + '\n')
+        self.log_text.insert('end', text)
+        # Drop the oldest lines so redraw cost stays bounded
+        lines = int(self.log_text.index('end-1c').split('.')[0])
+        if lines > LOG_VIEW_MAX_LINES:
+            self.log_text.delete('1.0', f'{lines - LOG_VIEW_MAX_LINES}.0')
         self.log_text.see('end')
         self.log_text.config(state='disabled')
-        self.root.update()
         
     def browse_path(self):
         """Browse for installation directory"""
@@ -216,28 +424,32 @@ class PalFriendLauncherGUI:
             self.install_path.set(path)
             self.log_to_ui(f"Installation path changed to: {path}")
     
-    def check_disk_space(self, path, required_mb=500):
+    def check_disk_space(self, info, required_mb=500):
         """Check if there's enough disk space"""
-        try:
-            stat = shutil.disk_usage(path)
-            available_mb = stat.free / (1024 * 1024)
-            self.log_to_ui(f"Available disk space: {available_mb:.0f} MB")
-            
-            if available_mb < required_mb:
-                self.log_to_ui(f"WARNING: Low disk space. Required: {required_mb} MB", "WARNING")
-                return False
-            return True
-        except Exception as e:
-            self.log_to_ui(f"Could not check disk space: {e}", "WARNING")
+        if info.free_bytes is None:
+            self.log_to_ui(f"Could not check disk space: {info.disk_error}", "WARNING")
             return True  # Continue anyway
+        
+        available_mb = info.free_bytes / (1024 * 1024)
+        self.log_to_ui(f"Available disk space: {available_mb:.0f} MB")
+        
+        if available_mb < required_mb:
+            self.log_to_ui(f"WARNING: Low disk space. Required: {required_mb} MB", "WARNING")
+            return False
+        return True
     
-    def check_write_permissions(self, path):
+    def check_write_permissions(self, info):
         """Check if we have write permissions"""
+        path = info.path
         try:
             # Try to create the directory if it doesn't exist
-            os.makedirs(path, exist_ok=True)
+            if not info.exists:
+                os.makedirs(path, exist_ok=True)
+            elif os.access(path, os.W_OK):
+                self.log_to_ui(f"Write permissions verified for: {path}")
+                return True
             
-            # Try to create a test file
+            # Fall back to creating a test file
             test_file = os.path.join(path, '.palfriend_test')
             with open(test_file, 'w') as f:
                 f.write('test')
@@ -252,53 +464,74 @@ class PalFriendLauncherGUI:
             self.log_to_ui(f"ERROR: Cannot write to {path}: {e}", "ERROR")
             return False
     
-    def check_existing_installation(self, path):
+    def check_existing_installation(self, info):
         """Check for existing installation"""
-        exe_path = os.path.join(path, 'palfriend', 'palfriend.exe')
+        if not info.exists:
+            # Directory was just created; nothing can be installed there
+            return None
+        
+        exe_path = os.path.join(info.path, 'palfriend', 'palfriend.exe')
         if os.path.exists(exe_path):
             self.log_to_ui(f"Found existing installation at: {exe_path}")
             
             # Try to get version
             try:
-                version_file = os.path.join(path, 'palfriend', 'VERSION')
-                if os.path.exists(version_file):
-                    with open(version_file, 'r') as f:
-                        version = f.read().strip()
-                    self.log_to_ui(f"Existing version: {version}")
+                version_file = os.path.join(info.path, 'palfriend', 'VERSION')
+                with open(version_file, 'r') as f:
+                    version = f.read().strip()
+                self.log_to_ui(f"Existing version: {version}")
             except Exception:
                 pass
                 
             return exe_path
         return None
     
-    def extract_embedded_payload(self, dest_path):
+    def extract_embedded_payload_async(self, dest_path, on_done):
         """
-        Extract embedded palfriend.exe from this launcher.
+        Extract embedded palfriend.exe from this launcher on a worker thread,
+        then call on_done(success) from Tk.
         
-        In a real implementation, this would extract from a bundled resource.
-        For now, this is a placeholder that shows where the logic would go.
+        The payload is the PyInstaller output directory (or a zip of it) bundled
+        as 'palfriend_payload' in sys._MEIPASS, or a 'palfriend_payload.zip'
+        shipped next to the launcher executable.
         """
         self.log_to_ui("Looking for embedded PalFriend application...")
         
-        # This is where you would extract from bundled data
-        # For example, if palfriend was bundled as a PyInstaller resource:
-        # - It could be in sys._MEIPASS
-        # - Or appended to the end of this executable
-        # - Or stored in a resources section
-        
-        # Placeholder: Check if running from PyInstaller bundle
         if getattr(sys, 'frozen', False):
-            bundle_dir = sys._MEIPASS
-            bundled_palfriend = os.path.join(bundle_dir, 'palfriend_payload')
+            candidates = [os.path.join(sys._MEIPASS, name) for name in PAYLOAD_NAMES]
+            candidates.append(os.path.join(os.path.dirname(sys.executable), PAYLOAD_NAMES[1]))
             
-            if os.path.exists(bundled_palfriend):
-                self.log_to_ui("Found embedded PalFriend application")
-                # Would extract here
-                return True
+            for payload in candidates:
+                if not os.path.exists(payload):
+                    continue
+                self.log_to_ui(f"Found embedded PalFriend application: {payload}")
+                written = [0]  # files written so far, updated by the worker
+                
+                def count(n):
+                    written[0] = n
+                
+                future = self._pool.submit(extract_payload, payload, os.path.join(dest_path, 'palfriend'), count)
+                self.root.after(50, self._poll_extract, future, written, on_done)
+                return
         
         self.log_to_ui("No embedded payload found", "WARNING")
         self.log_to_ui("NOTE: This launcher would download from GitHub Releases in production", "INFO")
-        return False
+        on_done(False)
+    
+    def _poll_extract(self, future, written, on_done):
+        """Show extraction progress until the worker finishes"""
+        if not future.done():
+            self.progress_var.set(f"Installing PalFriend... {written[0]} files")
+            self.root.after(50, self._poll_extract, future, written, on_done)
+            return
+        
+        try:
+            self.log_to_ui(f"Extracted {future.result()} files")
+            result = True
+        except Exception as e:
+            self.log_to_ui(f"ERROR extracting payload: {e}", "ERROR")
+            result = False
+        on_done(result)
     
     def download_from_github(self, dest_path):
         """
@@ -310,41 +543,59 @@ class PalFriendLauncherGUI:
         self.log_to_ui("In production, this would download the latest release", "INFO")
         return False
     
-    def verify_integrity(self, file_path, expected_sha256=None):
-        """Verify file integrity with SHA256"""
+    def verify_integrity_async(self, file_path, on_done, expected_sha256=None):
+        """Verify file integrity on a worker thread, then call on_done(result) from Tk"""
         if not os.path.exists(file_path):
             self.log_to_ui(f"ERROR: File not found: {file_path}", "ERROR")
-            return False
-            
+            on_done(False)
+            return
+        
+        self.log_to_ui(f"Calculating SHA256 for: {file_path}")
+        hashed = [0]  # bytes hashed so far, written by the worker
+        
+        def count(n):
+            hashed[0] += n
+        
+        self.progress.stop()
+        self.progress.config(mode='determinate', maximum=max(os.path.getsize(file_path), 1), value=0)
+        future = self._pool.submit(sha256_file, file_path, count)
+        self.root.after(50, self._poll_hash, future, hashed, expected_sha256, on_done)
+    
+    def _poll_hash(self, future, hashed, expected_sha256, on_done):
+        """Update hashing progress until the worker finishes"""
+        self.progress.config(value=hashed[0])
+        if not future.done():
+            self.root.after(50, self._poll_hash, future, hashed, expected_sha256, on_done)
+            return
+        
+        self.progress.config(mode='indeterminate', value=0)
         try:
-            self.log_to_ui(f"Calculating SHA256 for: {file_path}")
-            sha256_hash = hashlib.sha256()
-            
-            with open(file_path, "rb") as f:
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(byte_block)
-            
-            calculated = sha256_hash.hexdigest()
-            self.log_to_ui(f"SHA256: {calculated}")
-            
-            if expected_sha256:
-                if calculated == expected_sha256:
-                    self.log_to_ui("✓ Integrity check passed")
-                    return True
-                else:
-                    self.log_to_ui("✗ Integrity check FAILED", "ERROR")
-                    return False
-            
-            # If no expected hash, just report the calculated one
-            return True
+            result = self._check_digest(future.result(), expected_sha256)
         except Exception as e:
             self.log_to_ui(f"ERROR during integrity check: {e}", "ERROR")
-            return False
+            result = False
+        on_done(result)
+    
+    def _check_digest(self, calculated, expected_sha256):
+        """Log a calculated digest and compare it to the expected one"""
+        self.log_to_ui(f"SHA256: {calculated}")
+        
+        if expected_sha256:
+            if calculated == expected_sha256:
+                self.log_to_ui("✓ Integrity check passed")
+                return True
+            else:
+                self.log_to_ui("✗ Integrity check FAILED", "ERROR")
+                return False
+        
+        # If no expected hash, just report the calculated one
+        return True
     
     def check_and_install(self):
         """Main installation workflow"""
         self.install_btn.config(state='disabled')
         self.progress.start()
+        pending = False
         
         try:
             install_path = self.install_path.get()
@@ -352,9 +603,12 @@ class PalFriendLauncherGUI:
             self.log_to_ui("Starting PalFriend installation check...")
             self.log_to_ui(f"Target path: {install_path}")
             
+            # Gather the filesystem facts all checks need in one pass
+            dir_info = probe_install_dir(install_path)
+            
             # Step 1: Check disk space
             self.progress_var.set("Checking disk space...")
-            if not self.check_disk_space(install_path):
+            if not self.check_disk_space(dir_info):
                 if not messagebox.askyesno("Low Disk Space", 
                     "Available disk space is low. Continue anyway?"):
                     self.log_to_ui("Installation cancelled by user")
@@ -362,7 +616,7 @@ class PalFriendLauncherGUI:
             
             # Step 2: Check write permissions
             self.progress_var.set("Checking permissions...")
-            if not self.check_write_permissions(install_path):
+            if not self.check_write_permissions(dir_info):
                 messagebox.showerror("Permission Error",
                     f"Cannot write to {install_path}.\n\n"
                     "Please choose a different location or run as administrator.")
@@ -370,7 +624,7 @@ class PalFriendLauncherGUI:
             
             # Step 3: Check existing installation
             self.progress_var.set("Checking for existing installation...")
-            existing = self.check_existing_installation(install_path)
+            existing = self.check_existing_installation(dir_info)
             if existing:
                 if messagebox.askyesno("Existing Installation",
                     "PalFriend is already installed at this location.\n\n"
@@ -384,15 +638,27 @@ class PalFriendLauncherGUI:
                     messagebox.showinfo("Success", "PalFriend is ready to launch!")
                     return
             
-            # Step 4: Install PalFriend
+            # Step 4: Install PalFriend; the copy runs off the UI thread and
+            # the install continues in the callback
             self.progress_var.set("Installing PalFriend...")
-            
+            self.extract_embedded_payload_async(
+                install_path, lambda ok: self._continue_install(install_path, ok)
+            )
+            pending = True
+                
+        except Exception as e:
+            self._report_install_error(e)
+        finally:
+            if not pending:
+                self._end_install()
+    
+    def _continue_install(self, install_path, extracted):
+        """Fall back to GitHub if needed, then verify the installed executable"""
+        verifying = False
+        
+        try:
             # Try embedded first, then GitHub
-            success = False
-            if self.extract_embedded_payload(install_path):
-                success = True
-            elif self.download_from_github(install_path):
-                success = True
+            success = extracted or self.download_from_github(install_path)
             
             if not success:
                 self.log_to_ui("=" * 50, "ERROR")
@@ -434,9 +700,19 @@ class PalFriendLauncherGUI:
                     "PalFriend installation failed. Check the log for details.")
                 return
             
-            # Verify integrity
-            self.verify_integrity(exe_path)
-            
+            # Verify integrity off the UI thread; the install finishes in the callback
+            self.verify_integrity_async(exe_path, lambda ok: self._finish_install(exe_path))
+            verifying = True
+                
+        except Exception as e:
+            self._report_install_error(e)
+        finally:
+            if not verifying:
+                self._end_install()
+    
+    def _finish_install(self, exe_path):
+        """Complete the installation once integrity verification is done"""
+        try:
             # Success!
             self.palfriend_exe_path = exe_path
             self.launch_btn.config(state='normal')
@@ -449,16 +725,23 @@ class PalFriendLauncherGUI:
             messagebox.showinfo("Success", 
                 "PalFriend has been installed successfully!\n\n"
                 "Click 'Launch PalFriend' to start the application.")
-                
         except Exception as e:
-            self.log_to_ui(f"FATAL ERROR: {e}", "ERROR")
-            self.log_to_ui(traceback.format_exc(), "ERROR")
-            messagebox.showerror("Installation Error",
-                f"An error occurred during installation:\n\n{e}\n\n"
-                "Click 'Copy Diagnostics' to get detailed error information.")
+            self._report_install_error(e)
         finally:
-            self.progress.stop()
-            self.install_btn.config(state='normal')
+            self._end_install()
+    
+    def _report_install_error(self, e):
+        """Log and show an unexpected installation error"""
+        self.log_to_ui(f"FATAL ERROR: {e}", "ERROR")
+        self.log_to_ui(traceback.format_exc(), "ERROR")
+        messagebox.showerror("Installation Error",
+            f"An error occurred during installation:\n\n{e}\n\n"
+            "Click 'Copy Diagnostics' to get detailed error information.")
+    
+    def _end_install(self):
+        """Reset the controls after an installation attempt"""
+        self.progress.stop()
+        self.install_btn.config(state='normal')
     
     def launch_palfriend(self):
         """Launch the PalFriend application"""
@@ -470,13 +753,13 @@ class PalFriendLauncherGUI:
         try:
             self.log_to_ui(f"Launching PalFriend: {self.palfriend_exe_path}")
             
-            # Launch in a new process
-            if sys.platform == 'win32':
-                # Windows: Use CREATE_NEW_CONSOLE to launch in new window
-                subprocess.Popen([self.palfriend_exe_path], 
-                               creationflags=subprocess.CREATE_NEW_CONSOLE)
+            # Launch as a detached process
+            if _PLATFORM == 'win32':
+                # Windows: ShellExecute starts it directly, with its own console
+                # if it is a console app, and without inheriting our handles
+                os.startfile(self.palfriend_exe_path)
             else:
-                subprocess.Popen([self.palfriend_exe_path])
+                subprocess.Popen([self.palfriend_exe_path], start_new_session=True)
             
             self.log_to_ui("PalFriend launched successfully!")
             
@@ -498,23 +781,24 @@ class PalFriendLauncherGUI:
     
     def copy_diagnostics(self):
         """Copy diagnostics to clipboard"""
-        diagnostics = self.logger.get_diagnostics()
-        
-        # Add system info
-        full_diagnostics = f"""PalFriend Launcher Diagnostics
+        # System info header, then the log lines written straight into the buffer
+        buf = io.StringIO()
+        buf.write(f"""PalFriend Launcher Diagnostics
 Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 Launcher Version: {LAUNCHER_VERSION}
-Python Version: {sys.version}
-Platform: {sys.platform}
+Python Version: {_PY_VERSION}
+Platform: {_PLATFORM}
 
 {'=' * 60}
 LOG MESSAGES:
 {'=' * 60}
-{diagnostics}
-"""
+""")
+        for message in self.logger.messages:
+            buf.write(message)
+            buf.write('\n')
         
         self.root.clipboard_clear()
-        self.root.clipboard_append(full_diagnostics)
+        self.root.clipboard_append(buf.getvalue())
         
         messagebox.showinfo("Diagnostics Copied",
             "Diagnostics have been copied to clipboard.\n\n"
@@ -534,8 +818,8 @@ def main():
         messagebox.showerror("Fatal Error",
             f"PalFriend Launcher encountered a fatal error:\n\n{e}\n\n"
             f"Please report this issue with the following details:\n"
-            f"Python: {sys.version}\n"
-            f"Platform: {sys.platform}")
+            f"Python: {_PY_VERSION}\n"
+            f"Platform: {_PLATFORM}")
         sys.exit(1)
 
 
@@ -3,13 +3,21 @@ Event handling and deduplication for TikTok live events.
 """
 
 import asyncio
-import hashlib
 import logging
 import time
-from typing import Dict, Set
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Deque, Dict, Hashable, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 log = logging.getLogger("ChatPalBrain")
 
+# Folds the signed built-in hash into an unsigned 64-bit signature
+_HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+# Upper bound on nicknames waiting for a join announcement
+MAX_PENDING_JOINS = 500
+
 
 class EventDeduper:
     """
@@ -24,64 +32,162 @@ class EventDeduper:
             ttl: Time-to-live in seconds for event signatures
         """
         self.ttl = ttl
-        self._store: Dict[str, float] = {}
-        self._lock = asyncio.Lock()
+        # Signature -> expiry time; the TTL is fixed, so insertion order is expiry order
+        self._store: "OrderedDict[Hashable, float]" = OrderedDict()
     
-    async def seen(self, signature: str) -> bool:
+    def seen(self, signature: Hashable) -> bool:
         """
         Check if an event signature has been seen recently.
         
+        Synchronous and lock-free: it never awaits, so nothing can interleave
+        with it on the event loop.
+        
         Args:
-            signature: Event signature hash
+            signature: Event signature from make_signature()
         
         Returns:
             True if event was seen recently, False otherwise
         """
         now = time.time()
-        async with self._lock:
-            # Remove expired entries periodically
-            if len(self._store) > 1000:
-                expired = {k for k, v in self._store.items() if v < now}
-                for k in expired:
-                    del self._store[k]
-            
-            if signature in self._store:
-                return True
-            
-            self._store[signature] = now + self.ttl
-            
-            # Keep max size to prevent memory issues
-            if len(self._store) > 5000:
-                # Remove oldest entries
-                sorted_items = sorted(self._store.items(), key=lambda x: x[1])
-                to_remove = len(self._store) - 4000
-                for k, _ in sorted_items[:to_remove]:
-                    del self._store[k]
-            
-            return False
+        store = self._store
+        # Remove expired entries from the front
+        while store and next(iter(store.values())) < now:
+            store.popitem(last=False)
+        
+        if signature in store:
+            return True
+        
+        store[signature] = now + self.ttl
+        
+        # Keep max size to prevent memory issues
+        if len(store) > 5000:
+            # Remove oldest entries
+            while len(store) > 4000:
+                store.popitem(last=False)
+        
+        return False
+
+
+@dataclass
+class Viewer:
+    """Live-session state for one viewer; slotted because thousands can be tracked at once."""
+    
+    __slots__ = ('uid', 'nick', 'joined', 'last_active', 'greeted')
+    uid: str
+    nick: str
+    joined: float
+    last_active: float
+    greeted: bool
 
 
-def make_signature(prefix: str, *parts) -> str:
+class LikeBurst(NamedTuple):
+    """Likes from one viewer summed over a coalescing window."""
+    user: Any
+    count: int
+
+
+class PendingJoins:
+    """
+    Insertion-ordered, bounded set of nicknames awaiting a join announcement.
+    """
+    
+    def __init__(self, maxlen: int = MAX_PENDING_JOINS) -> None:
+        """
+        Initialize the pending join set.
+        
+        Args:
+            maxlen: Maximum number of names kept; the oldest are dropped first
+        """
+        self.maxlen = maxlen
+        self._names: "OrderedDict[str, None]" = OrderedDict()
+        # Created lazily so the event belongs to the loop that waits on it
+        self._added: Optional[asyncio.Event] = None
+    
+    def add(self, nick: str) -> None:
+        """
+        Add a nickname, moving it to the back if already pending.
+        
+        Args:
+            nick: Viewer nickname
+        """
+        names = self._names
+        names[nick] = None
+        names.move_to_end(nick)
+        while len(names) > self.maxlen:
+            names.popitem(last=False)
+        if self._added is not None:
+            self._added.set()
+    
+    def discard(self, nick: str) -> None:
+        """
+        Remove a nickname if present.
+        
+        Args:
+            nick: Viewer nickname
+        """
+        self._names.pop(nick, None)
+    
+    def take(self, n: int) -> List[str]:
+        """
+        Remove and return up to n of the oldest pending nicknames.
+        
+        Args:
+            n: Maximum number of names to take
+        
+        Returns:
+            Nicknames in the order they were added
+        """
+        names = list(islice(self._names, n))
+        for nick in names:
+            del self._names[nick]
+        return names
+    
+    async def wait(self) -> None:
+        """
+        Wait until at least one nickname is pending.
+        """
+        if self._added is None:
+            self._added = asyncio.Event()
+        while not self._names:
+            self._added.clear()
+            await self._added.wait()
+    
+    def __contains__(self, nick: object) -> bool:
+        return nick in self._names
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+    
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+def make_signature(prefix: str, *parts, unique_id: Optional[Any] = None) -> Hashable:
     """
     Create a unique signature for an event.
     
     Args:
         prefix: Event type prefix
         *parts: Additional parts to include in signature
+        unique_id: Provider-assigned ID that already identifies the event
+            (e.g. a TikTok message ID); when given, parts are not hashed
     
     Returns:
-        SHA1 hash of the signature (used for deduplication, not cryptography)
+        (prefix, unique_id) if unique_id is given, otherwise a 64-bit hash of
+        the signature (used for deduplication, not cryptography)
     
     Note:
-        SHA1 is used here for fast event deduplication, not for security purposes.
-        The hash is not used for authentication or data integrity verification.
+        Uses the built-in tuple hash, which is seeded per process. Signatures
+        only live in memory, so they never need to be stable across runs.
     """
-    raw = prefix + "|" + "|".join(str(p) for p in parts)
-    # SHA1 used for non-cryptographic deduplication only
-    return hashlib.sha1(raw.encode("utf-8", errors="ignore"), usedforsecurity=False).hexdigest()  # nosec B324
+    if unique_id is not None:
+        return (prefix, unique_id)
+    
+    # No encoding or digest: str hashes are SipHash in C and cached per object
+    return hash((prefix, *[str(p) for p in parts])) & _HASH_MASK
 
 
-def touch_viewer(viewers: Dict[str, Dict], uid: str, nick: str = "") -> Dict:
+def touch_viewer(viewers: Dict[str, Viewer], uid: str, nick: str = "") -> Viewer:
     """
     Update or create viewer tracking information.
     
@@ -91,18 +197,21 @@ def touch_viewer(viewers: Dict[str, Dict], uid: str, nick: str = "") -> Dict:
         nick: User nickname
     
     Returns:
-        Updated viewer dictionary
+        Updated viewer
     """
     now = time.time()
-    v = viewers.get(uid, {"nick": nick or uid, "joined": now, "last_active": now, "greeted": False})
+    v = viewers.get(uid)
+    if v is None:
+        v = Viewer(uid, nick or uid, now, now, False)
+        viewers[uid] = v
+        return v
     if nick:
-        v["nick"] = nick
-    v["last_active"] = now
-    viewers[uid] = v
+        v.nick = nick
+    v.last_active = now
     return v
 
 
-def should_consider_present(viewers: Dict[str, Dict], uid: str, active_ttl_seconds: int) -> bool:
+def should_consider_present(viewers: Dict[str, Viewer], uid: str, active_ttl_seconds: int) -> bool:
     """
     Check if a viewer should be considered present based on recent activity.
     
@@ -117,59 +226,106 @@ def should_consider_present(viewers: Dict[str, Dict], uid: str, active_ttl_secon
     v = viewers.get(uid)
     if not v:
         return False
-    return (time.time() - v["last_active"]) <= active_ttl_seconds
+    return (time.time() - v.last_active) <= active_ttl_seconds
 
 
-async def schedule_greeting(
-    uid: str,
-    viewers: Dict[str, Dict],
-    greet_tasks: Dict[str, asyncio.Task],
-    pending_joins: Set[str],
-    memory_db,  # MemoryDB instance
-    cfg: Dict
-) -> None:
+class GreetingScheduler:
     """
-    Schedule a greeting for a user after a delay.
+    Greets joining viewers after a delay from one long-lived task.
     
-    Args:
-        uid: User unique ID
-        viewers: Dictionary of active viewers
-        greet_tasks: Dictionary of active greeting tasks
-        pending_joins: Set of pending join greetings
-        memory_db: MemoryDB instance
-        cfg: Main configuration
+    Every join waits the same greet_after_seconds, so due times are reached
+    in insertion order and a FIFO queue serves as the timer queue.
     """
-    if not int(cfg.get("join_rules", {}).get("enabled", 1)):
-        return
-    
-    delay = int(cfg.get("join_rules", {}).get("greet_after_seconds", 30))
-    try:
-        await asyncio.sleep(delay)
-        v = viewers.get(uid)
-        if not v:
-            return
-        if v.get("greeted"):
-            return
+    
+    def __init__(
+        self,
+        viewers: Dict[str, Viewer],
+        pending_joins: PendingJoins,
+        memory_db,  # MemoryDB instance
+        cfg: Dict
+    ) -> None:
+        """
+        Initialize greeting scheduler.
         
-        user = await memory_db.get_user(uid)
-        gcool = int(cfg.get("comment", {}).get("greeting_cooldown", 360))
-        if time.time() - user.last_greet < gcool:
-            return
+        Args:
+            viewers: Dictionary of active viewers
+            pending_joins: Pending join greetings
+            memory_db: MemoryDB instance
+            cfg: Main configuration
+        """
+        join_rules = cfg.get("join_rules", {})
+        self.viewers = viewers
+        self.pending_joins = pending_joins
+        self.memory_db = memory_db
+        self.enabled = bool(int(join_rules.get("enabled", 1)))
+        self.delay = int(join_rules.get("greet_after_seconds", 30))
+        self.active_ttl = int(join_rules.get("active_ttl_seconds", 45))
+        self.greet_cooldown = int(cfg.get("comment", {}).get("greeting_cooldown", 360))
+        # (due time, uid), oldest first; _scheduled mirrors the uids for O(1) lookups
+        self._queue: Deque[Tuple[float, str]] = deque()
+        self._scheduled: Set[str] = set()
+        self._wake = asyncio.Event()
+    
+    def schedule(self, uid: str) -> None:
+        """
+        Queue a greeting check for a viewer unless one is already pending.
         
-        if not should_consider_present(
-            viewers,
-            uid,
-            int(cfg.get("join_rules", {}).get("active_ttl_seconds", 45))
-        ):
+        Args:
+            uid: User unique ID
+        """
+        if not self.enabled or uid in self._scheduled:
             return
+        self._scheduled.add(uid)
+        self._queue.append((time.monotonic() + self.delay, uid))
+        self._wake.set()
+    
+    async def run(self) -> None:
+        """
+        Background worker that greets viewers as their delay expires.
+        """
+        queue = self._queue
+        while True:
+            if not queue:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            
+            wait = queue[0][0] - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            
+            _, uid = queue.popleft()
+            self._scheduled.discard(uid)
+            await self.greet(uid)
+    
+    async def greet(self, uid: str) -> None:
+        """
+        Queue a join greeting if the viewer is still present and not greeted recently.
         
-        v["greeted"] = True
-        # Update last_greet time
-        user.last_greet = time.time()
-        await memory_db.save_user(user)
-        pending_joins.add(v["nick"])
-        log.info(f"Greet queued (pending summary): {v['nick']}")
-    except Exception as e:
-        log.error(f"Greet task error uid={uid}: {e}")
-    finally:
-        greet_tasks.pop(uid, None)
+        Args:
+            uid: User unique ID
+        """
+        try:
+            v = self.viewers.get(uid)
+            if not v:
+                return
+            if v.greeted:
+                return
+            
+            # Cheap in-memory check first so departed viewers never hit the DB
+            if not should_consider_present(self.viewers, uid, self.active_ttl):
+                return
+            
+            user = await self.memory_db.get_user(uid)
+            if time.time() - user.last_greet < self.greet_cooldown:
+                return
+            
+            v.greeted = True
+            # Update last_greet time
+            user.last_greet = time.time()
+            await self.memory_db.save_user(user)
+            self.pending_joins.add(v.nick)
+            log.info(f"Greet queued (pending summary): {v.nick}")
+        except Exception as e:
+            log.error(f"Greet task error uid={uid}: {e}")
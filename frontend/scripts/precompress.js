@@ -0,0 +1,36 @@
+// Writes .br and .gz siblings for text assets in the build output so the
+// Flask server can send them without compressing on every request.
+import { readdirSync, readFileSync, statSync, writeFileSync } from 'node:fs';
+import { extname, join } from 'node:path';
+import { fileURLToPath } from 'node:url';
+import { brotliCompressSync, constants, gzipSync } from 'node:zlib';
+
+const BUILD_DIR = fileURLToPath(new URL('../build/', import.meta.url));
+const EXTENSIONS = new Set(['.html', '.js', '.css', '.svg', '.json', '.txt', '.map']);
+
+function walk(dir) {
+  for (const name of readdirSync(dir)) {
+    const path = join(dir, name);
+    if (statSync(path).isDirectory()) {
+      walk(path);
+    } else if (EXTENSIONS.has(extname(name))) {
+      compress(path);
+    }
+  }
+}
+
+function compress(path) {
+  const data = readFileSync(path);
+  const variants = [
+    ['.br', brotliCompressSync(data, { params: { [constants.BROTLI_PARAM_QUALITY]: 11 } })],
+    ['.gz', gzipSync(data, { level: 9 })]
+  ];
+  for (const [suffix, packed] of variants) {
+    // Only keep variants that actually save bytes
+    if (packed.length < data.length) {
+      writeFileSync(path + suffix, packed);
+    }
+  }
+}
+
+walk(BUILD_DIR);
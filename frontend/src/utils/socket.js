@@ -32,6 +32,11 @@ class SocketService {
         this.emit(event, data);
       });
     });
+
+    // Logs arrive batched; deliver them to 'log' listeners one entry at a time
+    this.socket.on('log_batch', (entries) => {
+      entries.forEach(entry => this.emit('log', entry));
+    });
   }
 
   disconnect() {
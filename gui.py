@@ -3,11 +3,15 @@ GUI module for configuration and monitoring interface.
 """
 
 import asyncio
+import concurrent.futures
+import copy
 import logging
 import threading
+import time
 import tkinter as tk
+from collections import deque
 from tkinter import ttk, messagebox, scrolledtext
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import sounddevice as sd
 
@@ -15,6 +19,30 @@ from settings import save_settings
 
 log = logging.getLogger("ChatPalBrain")
 
+# (section, key) pairs of configuration entries that are not plain strings
+NUMERIC_KEYS = frozenset({
+    ("style", "max_line_length"),
+    ("comment", "enabled"), ("comment", "global_cooldown"), ("comment", "per_user_cooldown"),
+    ("comment", "min_length"), ("comment", "max_replies_per_min"),
+    ("comment", "respond_to_greetings"), ("comment", "greeting_cooldown"),
+    ("comment", "respond_to_thanks"),
+    (None, "dedupe_ttl"), ("animaze", "port"),
+    ("microphone", "enabled"), ("microphone", "attack_ms"), ("microphone", "release_ms"),
+    ("microphone", "flush_delay_ms"),
+    ("join_rules", "enabled"), ("join_rules", "greet_after_seconds"),
+    ("join_rules", "active_ttl_seconds"),
+    ("join_rules", "min_idle_since_last_output_sec"),
+    ("join_rules", "greet_global_cooldown_sec"),
+    ("outbox", "window_seconds"), ("outbox", "max_items"), ("outbox", "max_chars"),
+    ("speech", "wait_start_timeout_ms"), ("speech", "max_speech_ms"),
+    ("speech", "post_gap_ms")
+})
+FLOAT_KEYS = frozenset({("comment", "reply_threshold"), ("microphone", "silence_threshold")})
+LIST_KEYS = frozenset({("comment", "ignore_if_startswith"), ("comment", "ignore_contains")})
+
+# Scroll direction for X11 wheel buttons
+_WHEEL_BUTTON_DELTA = {4: -1, 5: 1}
+
 
 class ScrollableFrame(ttk.Frame):
     """
@@ -42,54 +70,125 @@ class ScrollableFrame(ttk.Frame):
         self.columnconfigure(0, weight=1)
         self.rowconfigure(0, weight=1)
         
+        self._last_w = -1
+        self._width_pending = False
+        
         def _on_resize(event):
-            self.canvas.itemconfig(self.window_id, width=event.width)
+            # Configure fires per pixel while dragging; skip repeats and apply once idle
+            if event.width == self._last_w:
+                return
+            self._last_w = event.width
+            if not self._width_pending:
+                self._width_pending = True
+                self.after_idle(self._apply_width)
         
         self.canvas.bind("<Configure>", _on_resize)
         
         def _on_mousewheel(event):
-            delta = 0
-            if getattr(event, 'num', None) == 4:
-                delta = -1
-            elif getattr(event, 'num', None) == 5:
-                delta = 1
-            elif getattr(event, 'delta', 0):
+            # X11 reports buttons 4/5; Windows/macOS report a signed delta
+            delta = _WHEEL_BUTTON_DELTA.get(event.num)
+            if delta is None:
+                if not event.delta:
+                    return
                 delta = -1 if event.delta > 0 else 1
             self.canvas.yview_scroll(delta, "units")
         
-        self.canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        self.canvas.bind_all("<Button-4>", _on_mousewheel)
-        self.canvas.bind_all("<Button-5>", _on_mousewheel)
+        wheel_events = ("<MouseWheel>", "<Button-4>", "<Button-5>")
+        
+        # Route wheel events here only while the pointer is over this frame,
+        # so scrolling the log widget does not scroll the settings too
+        def _bind_wheel(event):
+            for seq in wheel_events:
+                self.canvas.bind_all(seq, _on_mousewheel)
+        
+        def _unbind_wheel(event):
+            try:
+                target = str(self.winfo_containing(event.x_root, event.y_root))
+            except (KeyError, tk.TclError):
+                target = ""
+            own = str(self)
+            if target == own or target.startswith(own + "."):
+                return  # moved onto one of our own child widgets
+            for seq in wheel_events:
+                self.canvas.unbind_all(seq)
+        
+        self.bind("<Enter>", _bind_wheel)
+        self.bind("<Leave>", _unbind_wheel)
+    
+    def _apply_width(self) -> None:
+        """Stretch the inner frame to the latest canvas width."""
+        self._width_pending = False
+        self.canvas.itemconfigure(self.window_id, width=self._last_w)
 
 
 class GUIHandler(logging.Handler):
     """
-    Custom logging handler that outputs to a text widget.
+    Custom logging handler that buffers records for a text widget.
+    
+    emit() may run on any thread and never touches Tk; the GUI drains the
+    buffer periodically on the Tk thread (see ConfigGUI._flush_logs).
     """
     
+    BUFFER_SIZE = 2000
+    
     def __init__(self, text_widget: scrolledtext.ScrolledText) -> None:
         """
         Initialize GUI logging handler.
         
         Args:
-            text_widget: Text widget to write logs to
+            text_widget: Text widget the buffered logs are written to
         """
         super().__init__()
         self.text_widget = text_widget
+        # Ring buffer: if the GUI falls behind, the oldest lines are dropped
+        self._buf: deque = deque(maxlen=self.BUFFER_SIZE)
+        self._buf_lock = threading.Lock()
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        """
+        Filter and emit a record without taking the handler's I/O lock.
+        
+        The logger has already applied this handler's level; emit() only
+        touches the buffer, which has its own lock.
+        
+        Args:
+            record: Log record to handle
+        
+        Returns:
+            Result of the filter check
+        """
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
     
     def emit(self, record: logging.LogRecord) -> None:
         """
-        Emit a log record to the text widget.
+        Buffer a formatted log record.
         
         Args:
             record: Log record to emit
         """
         try:
             msg = self.format(record)
-            self.text_widget.insert(tk.END, msg + "\n")
-            self.text_widget.see(tk.END)
+            with self._buf_lock:
+                self._buf.append(msg)
         except Exception:
-            pass
+            self.handleError(record)
+    
+    def drain(self) -> List[str]:
+        """
+        Take all buffered log lines.
+        
+        Returns:
+            Buffered lines, oldest first
+        """
+        with self._buf_lock:
+            if not self._buf:
+                return []
+            batch = list(self._buf)
+            self._buf.clear()
+        return batch
 
 
 class ConfigGUI(tk.Tk):
@@ -97,6 +196,13 @@ class ConfigGUI(tk.Tk):
     Main configuration GUI window.
     """
     
+    LOG_FLUSH_MS = 50
+    LOG_MAX_LINES = 2000
+    LOG_TRIM_EVERY = 200  # lines inserted between line-count checks
+    VU_EPSILON = 0.01  # smallest level change worth repainting the VU meter
+    DEVICE_CACHE_TTL = 30.0  # seconds before the input device list is re-queried
+    SAVE_DEBOUNCE_MS = 500
+    
     def __init__(self, cfg: Dict[str, Any], start_callback) -> None:
         """
         Initialize configuration GUI.
@@ -112,6 +218,13 @@ class ConfigGUI(tk.Tk):
         self.cfg = cfg
         self.start_callback = start_callback
         self.micmon_ref = None
+        self._vu_posted = 0.0
+        self._save_after_id = None
+        self._save_lock = threading.Lock()
+        
+        # One event loop for the bot, reused across "Save & Start" presses
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="bot-loop", daemon=True).start()
         
         self.grid_rowconfigure(0, weight=0)
         self.grid_rowconfigure(1, weight=0)
@@ -164,38 +277,71 @@ class ConfigGUI(tk.Tk):
             ("Speech: Post gap (ms)", "speech", "post_gap_ms")
         ]
         
+        # Hold back size propagation while the form is built; it is laid out once below
+        frm.grid_propagate(False)
+        
+        # One Treeview row per setting instead of a Label/Entry widget pair;
+        # double-click (or Enter) opens an in-place editor over the value cell
+        self.settings_tree = ttk.Treeview(
+            frm, columns=("value",), show="tree headings", height=len(entries), selectmode="browse"
+        )
+        self.settings_tree.heading("#0", text="Einstellung")
+        self.settings_tree.heading("value", text="Wert")
+        self.settings_tree.column("#0", width=300, stretch=False)
+        self.settings_tree.column("value", width=420, stretch=True)
+        self.settings_tree.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 3))
+        self.settings_tree.bind("<Double-1>", self._edit_setting)
+        self.settings_tree.bind("<Return>", self._edit_setting)
+        self._tree_keys: Dict[str, tuple] = {}
+        
+        # Flat (section, key) -> value view of the entries, built in one pass
+        self._flat: Dict[tuple, Any] = {}
+        for _label, sec, key in entries:
+            section = self.cfg.get(sec) if sec else self.cfg
+            self._flat[(sec, key)] = section.get(key) if isinstance(section, dict) else None
+        
         self.vars = {}
-        for i, (label, sec, key) in enumerate(entries):
-            ttk.Label(frm, text=f"{label}:").grid(row=i, column=0, sticky="w", pady=3, padx=(2, 8))
+        for label, sec, key in entries:
             val = self._get_val(sec, key)
-            if isinstance(val, list):
-                val = ",".join(map(str, val))
-            var = tk.StringVar(value=str(val))
+            if (sec, key) in NUMERIC_KEYS:
+                var = tk.IntVar(self)
+                var.set("" if val is None else val)
+            elif (sec, key) in FLOAT_KEYS:
+                var = tk.DoubleVar(self)
+                var.set("" if val is None else val)
+            else:
+                if isinstance(val, list):
+                    val = ",".join(map(str, val))
+                var = tk.StringVar(self, value=str(val))
             self.vars[(sec, key)] = var
-            ttk.Entry(frm, textvariable=var, width=56).grid(row=i, column=1, pady=3, sticky="ew")
+            iid = f"{sec}:{key}"
+            self._tree_keys[iid] = (sec, key)
+            self.settings_tree.insert("", "end", iid=iid, text=label, values=(self.getvar(str(var)),))
+            # Keep the row in sync when the value is set programmatically (e.g. device buttons)
+            var.trace_add("write", lambda *_args, iid=iid, var=var: self.settings_tree.set(
+                iid, "value", self.getvar(str(var))
+            ))
         
         # Device selection
-        dev_row = len(entries) + 1
+        dev_row = 1
         ttk.Label(frm, text="Input-Gerät wählen:").grid(row=dev_row, column=0, sticky="w", pady=(10, 3))
-        try:
-            devices = sd.query_devices()
-            self.input_devs = [
-                f"{i}: {d['name']}"
-                for i, d in enumerate(devices)
-                if (d.get('max_input_channels') or 0) > 0
-            ]
-        except Exception:
-            self.input_devs = []
-        
-        self.dev_combo_var = tk.StringVar(
-            value=self.input_devs[0] if self.input_devs else "Keine Eingänge gefunden"
-        )
+        # PortAudio enumeration can be slow; it runs on a worker thread after the first paint
+        self.input_devs: List[str] = []
+        self._dev_idx_map: Dict[str, str] = {}  # display string -> device index
+        self._devs_fetched_at: Optional[float] = None
+        self._devs_loading = False
+        
+        self.dev_combo_var = tk.StringVar(value="Geräte werden geladen…")
+        # Device index of the current selection, resolved once per change
+        self._selected_idx: Optional[str] = None
+        self.dev_combo_var.trace_add("write", self._on_dev_changed)
         self.dev_combo = ttk.Combobox(
             frm,
             textvariable=self.dev_combo_var,
             values=self.input_devs,
             state="readonly",
-            width=56
+            width=56,
+            postcommand=self._populate_devices
         )
         self.dev_combo.grid(row=dev_row, column=1, sticky="ew", pady=(10, 3))
         
@@ -220,6 +366,8 @@ class ConfigGUI(tk.Tk):
         self.vu.grid(row=vu_row, column=1, sticky="ew", pady=(8, 3))
         
         frm.columnconfigure(1, weight=1)
+        frm.grid_propagate(True)
+        frm.update_idletasks()
         
         # Buttons
         btn_frame = ttk.Frame(self)
@@ -236,44 +384,124 @@ class ConfigGUI(tk.Tk):
         self.log_text = scrolledtext.ScrolledText(self, wrap=tk.WORD)
         self.log_text.grid(row=2, column=0, sticky="nsew", padx=12, pady=(0, 12))
         self.log_text.configure(height=12)
-        logging.getLogger().addHandler(GUIHandler(self.log_text))
+        self._log_lines_since_trim = 0
+        # Only the app's own logger feeds the widget; library chatter stays on the console
+        self.log_handler = GUIHandler(self.log_text)
+        self.log_handler.setLevel(logging.INFO)
+        log.addHandler(self.log_handler)
+        
+        self.after(self.LOG_FLUSH_MS, self._flush_logs)
+        self.after_idle(self._populate_devices)
+    
+    def _populate_devices(self) -> None:
+        """Refresh the input device list in the background if the cached one is stale."""
+        if self._devs_loading:
+            return
+        if self._devs_fetched_at is not None and time.monotonic() - self._devs_fetched_at < self.DEVICE_CACHE_TTL:
+            return
+        self._devs_loading = True
+        threading.Thread(target=self._query_devices, daemon=True).start()
+    
+    def _query_devices(self) -> None:
+        """Enumerate input devices (worker thread) and hand the result to the Tk thread."""
+        try:
+            devices = sd.query_devices()
+            devs = {
+                f"{i}: {d['name']}": str(i)
+                for i, d in enumerate(devices)
+                if (d.get('max_input_channels') or 0) > 0
+            }
+        except Exception as e:
+            log.warning(f"Could not query audio devices: {e}")
+            devs = {}
+        try:
+            self.after(0, self._set_devices, devs)
+        except Exception:
+            pass  # window already destroyed
+    
+    def _set_devices(self, devs: Dict[str, str]) -> None:
+        """
+        Show a freshly queried device list in the combobox.
         
-        self.after(60, self._update_vu)
+        Args:
+            devs: Mapping of "index: name" display strings to device indices
+        """
+        self.input_devs = list(devs)
+        self._dev_idx_map = devs
+        self._devs_fetched_at = time.monotonic()
+        self._devs_loading = False
+        self.dev_combo.configure(values=self.input_devs)
+        if self.dev_combo_var.get() not in devs:
+            self.dev_combo_var.set(self.input_devs[0] if self.input_devs else "Keine Eingänge gefunden")
+        else:
+            self._on_dev_changed()
     
-    def _update_vu(self) -> None:
-        """Update VU meter display."""
+    def _on_dev_changed(self, *_args) -> None:
+        """Resolve the selected device string to its index."""
+        self._selected_idx = self._dev_idx_map.get(self.dev_combo_var.get())
+    
+    def _flush_logs(self) -> None:
+        """Write buffered log lines to the log widget in one insert."""
+        batch = self.log_handler.drain()
+        if batch:
+            self.log_text.insert(tk.END, "\n".join(batch) + "\n")
+            self._log_lines_since_trim += len(batch)
+            if self._log_lines_since_trim >= self.LOG_TRIM_EVERY:
+                self._trim_log()
+            self.log_text.see(tk.END)
+        self.after(self.LOG_FLUSH_MS, self._flush_logs)
+    
+    def _trim_log(self) -> None:
+        """Drop the oldest lines so the log widget stays under LOG_MAX_LINES."""
+        self._log_lines_since_trim = 0
+        # Text ends with a newline, so the last index line is empty
+        lines = int(self.log_text.index("end-1c").split(".")[0]) - 1
+        overflow = lines - self.LOG_MAX_LINES
+        if overflow > 0:
+            self.log_text.delete("1.0", f"{overflow + 1}.0")
+    
+    def post_mic_level(self, level: float) -> None:
+        """
+        Push a new microphone level to the VU meter.
+        
+        Called from the audio thread; only changes larger than VU_EPSILON are
+        forwarded to the Tk thread.
+        
+        Args:
+            level: Current RMS level
+        """
+        if abs(level - self._vu_posted) <= self.VU_EPSILON:
+            return
+        self._vu_posted = level
         try:
-            if self.micmon_ref:
-                self.vu["value"] = float(self.micmon_ref.level)
-            else:
-                self.vu["value"] = 0.0
+            self.after_idle(self._set_vu, level)
         except Exception:
-            self.vu["value"] = 0.0
-        self.after(60, self._update_vu)
+            pass  # window already destroyed
+    
+    def _set_vu(self, level: float) -> None:
+        """Update VU meter display."""
+        self.vu["value"] = level
     
     def apply_selected_device_to_cfg(self) -> None:
         """Apply selected device to configuration."""
-        sel = self.dev_combo_var.get()
-        if ":" in sel:
-            idx = sel.split(":")[0].strip()
-        else:
-            idx = sel.strip()
+        idx = self._selected_idx
+        if idx is None:
+            messagebox.showerror("Fehler", "Kein gültiges Eingabegerät gewählt.")
+            return
         
         if ("microphone", "device") in self.vars:
             self.vars[("microphone", "device")].set(idx)
         
         self.cfg.setdefault("microphone", {})["device"] = idx
-        save_settings(self.cfg)
+        self._schedule_save()
     
     def switch_device_live(self) -> None:
         """Switch microphone device without restart."""
-        sel = self.dev_combo_var.get()
-        if not sel or ":" not in sel:
+        idx = self._selected_idx
+        if idx is None:
             messagebox.showerror("Fehler", "Kein gültiges Eingabegerät gewählt.")
             return
         
-        idx = sel.split(":")[0].strip()
-        
         if not self.micmon_ref:
             messagebox.showerror("Fehler", "Mic-Monitor läuft noch nicht.")
             return
@@ -284,7 +512,7 @@ class ConfigGUI(tk.Tk):
             self.vars[("microphone", "device")].set(idx)
         
         self.cfg.setdefault("microphone", {})["device"] = idx
-        save_settings(self.cfg)
+        self._schedule_save()
     
     def _get_val(self, sec: Optional[str], key: str) -> Any:
         """
@@ -297,62 +525,130 @@ class ConfigGUI(tk.Tk):
         Returns:
             Configuration value
         """
-        if sec:
-            return self.cfg.get(sec, {}).get(key)
-        return self.cfg.get(key)
+        return self._flat.get((sec, key))
     
     def on_save(self) -> None:
         """Save configuration and start application."""
-        numeric_keys = {
-            ("style", "max_line_length"),
-            ("comment", "enabled"), ("comment", "global_cooldown"), ("comment", "per_user_cooldown"),
-            ("comment", "min_length"), ("comment", "max_replies_per_min"),
-            ("comment", "respond_to_greetings"), ("comment", "greeting_cooldown"),
-            ("comment", "respond_to_thanks"),
-            (None, "dedupe_ttl"), ("animaze", "port"),
-            ("microphone", "enabled"), ("microphone", "attack_ms"), ("microphone", "release_ms"),
-            ("microphone", "flush_delay_ms"),
-            ("join_rules", "enabled"), ("join_rules", "greet_after_seconds"),
-            ("join_rules", "active_ttl_seconds"),
-            ("join_rules", "min_idle_since_last_output_sec"),
-            ("join_rules", "greet_global_cooldown_sec"),
-            ("outbox", "window_seconds"), ("outbox", "max_items"), ("outbox", "max_chars"),
-            ("speech", "wait_start_timeout_ms"), ("speech", "max_speech_ms"),
-            ("speech", "post_gap_ms")
-        }
-        float_keys = {("comment", "reply_threshold"), ("microphone", "silence_threshold")}
-        list_keys = {("comment", "ignore_if_startswith"), ("comment", "ignore_contains")}
-        
+        values = {}
         for (sec, key), var in self.vars.items():
-            v = var.get().strip()
-            if (sec, key) in list_keys:
-                items = [x.strip() for x in v.split(",") if x.strip()]
-                if sec:
-                    self.cfg.setdefault(sec, {})[key] = items
-                else:
-                    self.cfg[key] = items
-                continue
-            
-            if (sec, key) in float_keys:
-                try:
-                    v = float(v)
-                except ValueError:
-                    messagebox.showerror("Ungültiger Wert", f"{key} muss eine Kommazahl sein.")
-                    return
-            elif (sec, key) in numeric_keys:
-                try:
-                    v = int(float(v))
-                except ValueError:
-                    messagebox.showerror("Ungültiger Wert", f"{key} muss eine Zahl sein.")
-                    return
-            
+            # IntVar/DoubleVar convert on get() and raise TclError on malformed input
+            try:
+                v = var.get()
+            except (tk.TclError, ValueError):
+                kind = "eine Kommazahl" if (sec, key) in FLOAT_KEYS else "eine Zahl"
+                messagebox.showerror("Ungültiger Wert", f"{key} muss {kind} sein.")
+                return
+            if (sec, key) in LIST_KEYS:
+                v = [x.strip() for x in v.split(",") if x.strip()]
+            elif isinstance(v, str):
+                v = v.strip()
+            values[(sec, key)] = v
+        
+        # Restore the nesting only when writing back
+        self._flat.update(values)
+        for (sec, key), v in values.items():
             if sec:
                 self.cfg.setdefault(sec, {})[key] = v
             else:
                 self.cfg[key] = v
         
-        save_settings(self.cfg)
+        self._save_now()
         messagebox.showinfo("Gespeichert", "Einstellungen gespeichert. Starte…")
         
-        # Start application in background thread
-        threading.Thread(target=lambda: asyncio.run(self.start_callback(self.cfg, self)), daemon=True).start()
+        # Start application on the background event loop
+        fut = asyncio.run_coroutine_threadsafe(self.start_callback(self.cfg, self), self._loop)
+        fut.add_done_callback(self._on_start_done)
+    
+    def _on_start_done(self, fut: concurrent.futures.Future) -> None:
+        """
+        Log a failed start so it reaches the console and the GUI log.
+        
+        Runs on the event loop thread; the GUI handler buffers the record
+        for the Tk thread.
+        
+        Args:
+            fut: Future of the start callback coroutine
+        """
+        if fut.cancelled():
+            return
+        exc = fut.exception()
+        if exc is not None:
+            log.error(f"Application start failed: {exc}", exc_info=exc)
+    
+    def _edit_setting(self, event) -> None:
+        """
+        Open an in-place editor over the value cell of a settings row.
+        
+        Args:
+            event: Double-click or key event from the settings tree
+        """
+        tree = self.settings_tree
+        if event.type == tk.EventType.KeyPress:
+            iid = tree.focus()
+        else:
+            iid = tree.identify_row(event.y)
+        if not iid:
+            return
+        tree.see(iid)
+        bbox = tree.bbox(iid, "value")
+        if not bbox:
+            return
+        x, y, width, height = bbox
+        var = self.vars[self._tree_keys[iid]]
+        
+        editor = ttk.Entry(tree)
+        editor.insert(0, str(self.getvar(str(var))))
+        editor.select_range(0, tk.END)
+        editor.place(x=x, y=y, width=width, height=height)
+        editor.focus_set()
+        done = []
+        
+        def finish(commit: bool) -> None:
+            if done:
+                return
+            done.append(True)
+            if commit:
+                var.set(editor.get())
+            editor.destroy()
+            tree.focus_set()
+        
+        editor.bind("<Return>", lambda _e: finish(True))
+        editor.bind("<KP_Enter>", lambda _e: finish(True))
+        editor.bind("<FocusOut>", lambda _e: finish(True))
+        editor.bind("<Escape>", lambda _e: finish(False))
+    
+    def _schedule_save(self) -> None:
+        """Save settings SAVE_DEBOUNCE_MS after the last change, off the Tk thread."""
+        if self._save_after_id is not None:
+            self.after_cancel(self._save_after_id)
+        self._save_after_id = self.after(self.SAVE_DEBOUNCE_MS, self._do_save)
+    
+    def _do_save(self) -> None:
+        """Write a snapshot of the settings on a worker thread."""
+        self._save_after_id = None
+        snapshot = copy.deepcopy(self.cfg)
+        threading.Thread(target=self._write_settings, args=(snapshot,), daemon=True).start()
+    
+    def _write_settings(self, cfg: Dict[str, Any]) -> None:
+        """
+        Write settings to disk, one writer at a time.
+        
+        Args:
+            cfg: Configuration dictionary to save
+        """
+        with self._save_lock:
+            save_settings(cfg)
+    
+    def _save_now(self) -> None:
+        """Drop any pending debounced save and write the settings immediately."""
+        if self._save_after_id is not None:
+            self.after_cancel(self._save_after_id)
+            self._save_after_id = None
+        self._write_settings(self.cfg)
+    
+    def destroy(self) -> None:
+        """Flush pending settings, stop the background event loop and close the window."""
+        if self._save_after_id is not None:
+            self._save_now()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        super().destroy()
@@ -8,9 +8,10 @@ It starts the PalFriend web interface automatically.
 import sys
 import os
 import logging
+import socket
 import webbrowser
 import time
-from threading import Timer
+from threading import Thread
 
 # Configure logging
 logging.basicConfig(
@@ -20,22 +21,48 @@ logging.basicConfig(
 log = logging.getLogger("PalFriend-Launcher")
 
 
-def open_browser(url: str, delay: float = 2.0):
+def wait_for_port(port: int, host: str = "127.0.0.1", timeout: float = 30.0, interval: float = 0.05) -> bool:
     """
-    Open browser after a delay to allow the server to start.
+    Wait until a TCP port accepts connections.
+    
+    Args:
+        port: Port to probe
+        host: Host to connect to
+        timeout: Maximum time to wait in seconds
+        interval: Delay between probes in seconds
+    
+    Returns:
+        True if the port accepted a connection before the timeout, False otherwise
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.settimeout(interval)
+            if s.connect_ex((host, port)) == 0:
+                return True
+        time.sleep(interval)
+    return False
+
+
+def open_browser(url: str, port: int, timeout: float = 30.0):
+    """
+    Open browser as soon as the server accepts connections.
     
     Args:
         url: URL to open
-        delay: Delay in seconds before opening browser
+        port: Port the server listens on
+        timeout: Maximum time to wait for the server in seconds
     """
     def _open():
+        if not wait_for_port(port, timeout=timeout):
+            log.warning(f"Server did not come up within {timeout:.0f}s; opening browser anyway")
         try:
             log.info(f"Opening browser to {url}")
             webbrowser.open(url)
         except Exception as e:
             log.error(f"Failed to open browser: {e}")
     
-    Timer(delay, _open).start()
+    Thread(target=_open, daemon=True).start()
 
 
 def main():
@@ -56,7 +83,7 @@ def main():
         port = int(os.environ.get('PORT', 5008))
         url = f"http://localhost:{port}"
         log.info(f"Starting PalFriend web interface on {url}")
-        open_browser(url, delay=3.0)
+        open_browser(url, port)
         
         # Start the Flask app
         app_main()
@@ -4,11 +4,11 @@ Main application entry point for TikTok ChatPal Brain.
 
 import asyncio
 import gc
-import json
 import logging
 import os
+import sys
 import time
-from typing import Dict, Any, Set, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import websockets
 from TikTokLive import TikTokLiveClient
@@ -27,22 +27,54 @@ from TikTokLive.events import (
 from settings import load_settings, save_settings
 from memory import MemoryDB
 from speech import SpeechState, MicState, MicrophoneMonitor
-from utils import trim_text, TokenBucket
+from utils import JSONDecodeError, json_dumps, json_loads, trim_text, TokenBucket
 from response import Relevance, ResponseEngine
 from outbox import OutboxBatcher
-from events import EventDeduper, make_signature, touch_viewer, schedule_greeting
+from events import EventDeduper, GreetingScheduler, LikeBurst, PendingJoins, Viewer, make_signature, touch_viewer
 from gui import ConfigGUI
 from modules.audio import AudioManager
 from modules.tts import TTSManager
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is not available on Windows
+    uvloop = None
+
 # Constants
 MAX_REPLY_THRESHOLD = 0.8
 DEFAULT_REPLY_THRESHOLD = 0.4
 ANIMAZE_RECONNECT_DELAY = 0.8
+# High-water mark for the Animaze socket's write buffer; sends never wait on drain
+ANIMAZE_WRITE_LIMIT = 1 << 20
+# Upper bound on TikTok events handed to the outbox in one add_many() call
+EVENT_BATCH_MAX = 32
+# Queue bounds; a like storm must not grow memory without limit
+MESSAGE_QUEUE_MAX = 100
+COMMENT_QUEUE_MAX = 500
+EVENT_QUEUE_MAX = 1000
+# Likes per viewer are summed over this window before reaching like_queue
+LIKE_WINDOW_S = 1.0
+# Mic state is flipped from the audio thread, so the join announcer polls it
+MIC_RECHECK_S = 1.0
+# Only the id and the JSON-escaped message vary between sends
+ANIMAZE_SEND_TEMPLATE = '{"action":"ChatbotSendMessage","id":"%d","message":%s,"priority":1}'
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
 log = logging.getLogger("ChatPalBrain")
 
+
+def install_event_loop_policy() -> None:
+    """
+    Use uvloop for new event loops when it is installed.
+    
+    Must run before the bot loop is created; loops that already exist keep
+    their implementation.
+    """
+    if uvloop is None or sys.platform == "win32":
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    log.info("uvloop event loop policy aktiv")
+
 # Global state
 animaze_ws = None
 message_queue: Optional[asyncio.Queue[str]] = None
@@ -54,11 +86,62 @@ follow_queue: Optional[asyncio.Queue] = None
 share_queue: Optional[asyncio.Queue] = None
 subscribe_queue: Optional[asyncio.Queue] = None
 
-LAST_OUTPUT_TS = 0.0
-LAST_JOIN_ANNOUNCE_TS = 0.0
-PENDING_JOINS: Set[str] = set()
-viewers: Dict[str, Dict] = {}
-greet_tasks: Dict[str, asyncio.Task] = {}
+# Monotonic timestamps; -inf means "never"
+LAST_OUTPUT_TS = float("-inf")
+LAST_JOIN_ANNOUNCE_TS = float("-inf")
+PENDING_JOINS = PendingJoins()
+viewers: Dict[str, Viewer] = {}
+
+
+def _offer(queue: asyncio.Queue, item: Any) -> bool:
+    """
+    Put an item without waiting, dropping it if the queue is full.
+    
+    Args:
+        queue: Target queue
+        item: Item to enqueue
+    
+    Returns:
+        True if the item was queued, False if it was dropped
+    """
+    try:
+        queue.put_nowait(item)
+        return True
+    except asyncio.QueueFull:
+        return False
+
+
+def _uid(user: Any) -> str:
+    """
+    Return the unique id of a TikTok event user, falling back to the numeric id.
+    
+    Args:
+        user: User object attached to a TikTok event
+    
+    Returns:
+        User id, or an empty string if the user carries none
+    """
+    try:
+        return user.uniqueId or user.id
+    except AttributeError:
+        return getattr(user, "uniqueId", "") or getattr(user, "id", "")
+
+
+def _nick(user: Any, uid: str) -> str:
+    """
+    Return the display name of a TikTok event user.
+    
+    Args:
+        user: User object attached to a TikTok event
+        uid: Fallback when the user has no nickname
+    
+    Returns:
+        Nickname or uid
+    """
+    try:
+        return user.nickname or uid
+    except AttributeError:
+        return uid
 
 
 async def connect_animaze(cfg: Dict[str, Any], speech: SpeechState) -> None:
@@ -80,7 +163,13 @@ async def connect_animaze(cfg: Dict[str, Any], speech: SpeechState) -> None:
     
     for attempt in range(max_attempts):
         try:
-            animaze_ws = await websockets.connect(animaze_uri, ping_interval=20, ping_timeout=20)
+            animaze_ws = await websockets.connect(
+                animaze_uri,
+                ping_interval=20,
+                ping_timeout=20,
+                compression=None,
+                write_limit=ANIMAZE_WRITE_LIMIT,
+            )
             log.info("Verbunden mit ChatPal WebSocket")
             asyncio.create_task(handle_animaze_messages(cfg, speech))
             return
@@ -108,9 +197,18 @@ async def handle_animaze_messages(cfg: Dict[str, Any], speech: SpeechState) -> N
     
     try:
         async for raw in animaze_ws:
+            # Speech state frames make up most of the traffic; dispatch them without parsing
+            if isinstance(raw, str):
+                if '"ChatbotSpeechStarted"' in raw:
+                    speech.mark_started()
+                    continue
+                if '"ChatbotSpeechEnded"' in raw:
+                    speech.mark_ended()
+                    continue
+            
             try:
-                msg = json.loads(raw)
-            except json.JSONDecodeError:
+                msg = json_loads(raw)
+            except JSONDecodeError:
                 continue
             
             act = msg.get("action") or msg.get("event") or ""
@@ -129,6 +227,19 @@ async def handle_animaze_messages(cfg: Dict[str, Any], speech: SpeechState) -> N
         asyncio.create_task(connect_animaze(cfg, speech))
 
 
+def encode_send_message(text: str) -> str:
+    """
+    Build the ChatbotSendMessage frame for Animaze.
+    
+    Args:
+        text: Message text to send
+    
+    Returns:
+        JSON text frame
+    """
+    return ANIMAZE_SEND_TEMPLATE % (time.time_ns(), json_dumps(text))
+
+
 async def send_to_animaze(text: str, cfg: Dict[str, Any]) -> None:
     """
     Queue a message to send to Animaze.
@@ -143,7 +254,14 @@ async def send_to_animaze(text: str, cfg: Dict[str, Any]) -> None:
     maxlen = int(cfg.get("style", {}).get("max_line_length", 140))
     t = trim_text(text, maxlen)
     log.info(f"→ ChatPal enqueue: {t}")
-    await message_queue.put(t)
+    if not _offer(message_queue, t):
+        # Never stall the outbox flush: make room by dropping the oldest line
+        try:
+            dropped = message_queue.get_nowait()
+            log.warning(f"ChatPal Queue voll, älteste Nachricht verworfen: {dropped}")
+        except asyncio.QueueEmpty:
+            pass
+        _offer(message_queue, t)
 
 
 async def sender_worker(
@@ -172,6 +290,11 @@ async def sender_worker(
     else:
         log.info("Using Animaze WebSocket for TTS")
     
+    speech_cfg = cfg.get("speech", {})
+    st = int(speech_cfg.get("wait_start_timeout_ms", 1200)) / 1000.0
+    mt = int(speech_cfg.get("max_speech_ms", 15000)) / 1000.0
+    pg = int(speech_cfg.get("post_gap_ms", 250)) / 1000.0
+    
     while True:
         text = await message_queue.get()
         
@@ -196,10 +319,9 @@ async def sender_worker(
                     speech.mark_ended()
                     
                     # Post-speech gap
-                    pg = int(cfg.get("speech", {}).get("post_gap_ms", 250)) / 1000.0
                     await asyncio.sleep(pg)
                     
-                    LAST_OUTPUT_TS = time.time()
+                    LAST_OUTPUT_TS = time.monotonic()
                     log.info(f"✓ TTS playback completed")
                 else:
                     log.error("TTS synthesis failed, skipping message")
@@ -218,44 +340,37 @@ async def sender_worker(
             if animaze_ws is None:
                 log.warning("ChatPal nicht erreichbar, retry wird eingeplant")
                 await asyncio.sleep(0.8)
-                await message_queue.put(text)
+                # Non-blocking: this worker is the queue's only consumer
+                if not _offer(message_queue, text):
+                    log.warning(f"Nachrichten-Queue voll, verworfen: {text}")
                 continue
             
             await speech.wait_idle()
             
             try:
-                payload = {
-                    "action": "ChatbotSendMessage",
-                    "id": str(time.time_ns()),
-                    "message": text,
-                    "priority": 1
-                }
-                log.info(f"→ ChatPal SEND: {payload['message']}")
-                await animaze_ws.send(json.dumps(payload))
-                
-                st = int(cfg.get("speech", {}).get("wait_start_timeout_ms", 1200)) / 1000.0
-                mt = int(cfg.get("speech", {}).get("max_speech_ms", 15000)) / 1000.0
-                pg = int(cfg.get("speech", {}).get("post_gap_ms", 250)) / 1000.0
+                log.info(f"→ ChatPal SEND: {text}")
+                # A str payload keeps Animaze receiving text frames
+                await animaze_ws.send(encode_send_message(text))
                 
                 started = await speech.wait_started(timeout=st)
                 if started:
                     await speech.wait_ended(timeout=mt)
                 await asyncio.sleep(pg)
                 
-                LAST_OUTPUT_TS = time.time()
+                LAST_OUTPUT_TS = time.monotonic()
             except Exception as e:
                 log.error(f"ChatPal SEND Fehler: {e}")
                 await asyncio.sleep(0.5)
-                await message_queue.put(text)
-        
-        await asyncio.sleep(0.02)
+                if not _offer(message_queue, text):
+                    log.warning(f"Nachrichten-Queue voll, verworfen: {text}")
 
 
 async def process_comments(
     cfg: Dict[str, Any],
     memory_db: MemoryDB,
     batcher: OutboxBatcher,
-    viewers: Dict[str, Dict]
+    viewers: Dict[str, Viewer],
+    scorer: Relevance
 ) -> None:
     """
     Process incoming comments and generate responses.
@@ -265,6 +380,7 @@ async def process_comments(
         memory_db: MemoryDB instance
         batcher: OutboxBatcher instance
         viewers: Active viewers dictionary
+        scorer: Relevance scorer shared with the TikTok listener
     """
     comment_cfg = cfg.get("comment", {})
     
@@ -273,6 +389,7 @@ async def process_comments(
             _ = await comment_queue.get()
         return
     
+    min_len = int(comment_cfg.get("min_length", 3))
     global_cd = int(comment_cfg.get("global_cooldown", 6))
     per_user_cd = int(comment_cfg.get("per_user_cooldown", 15))
     max_per_min = int(comment_cfg.get("max_replies_per_min", 20))
@@ -287,13 +404,22 @@ async def process_comments(
     greet_cd = int(comment_cfg.get("greeting_cooldown", 360))
     resp_thanks = bool(int(comment_cfg.get("respond_to_thanks", 1)))
     
-    scorer = Relevance(comment_cfg)
     resp = ResponseEngine(cfg, memory_db)
     bucket = TokenBucket(capacity=max_per_min, rate_per_sec=max(1, max_per_min) / 60.0)
     
+    # Cooldowns run on the monotonic clock so wall-clock jumps cannot skew them
+    clock = time.monotonic
     next_allowed_global = 0.0
     per_user_until_local: Dict[str, float] = {}
     
+    loop = asyncio.get_running_loop()
+    
+    async def wait_global_slot() -> None:
+        await bucket.take()
+        wait = next_allowed_global - clock()
+        if wait > 0:
+            await asyncio.sleep(max(0.01, wait))
+    
     while True:
         item = await comment_queue.get()
         try:
@@ -302,14 +428,15 @@ async def process_comments(
             nick = item["nick"]
             
             touch_viewer(viewers, uid, nick)
-            now = time.time()
+            now = clock()
             
-            if len(txt) < int(comment_cfg.get("min_length", 3)) or scorer.is_ignored(txt):
+            if len(txt) < min_len or scorer.is_ignored(txt):
                 continue
             
-            if now < per_user_until_local.get(uid, 0):
-                await asyncio.sleep(0.05)
-                await comment_queue.put(item)
+            until = per_user_until_local.get(uid, 0)
+            if now < until:
+                # Park the comment on the loop's timer heap until the user's cooldown ends
+                loop.call_later(until - now, _offer, comment_queue, item)
                 continue
             
             score = scorer.score(txt)
@@ -318,18 +445,19 @@ async def process_comments(
             # Handle greetings
             if resp_greet and scorer.is_greeting(txt) and ("?" not in txt) and (len(txt.split()) <= 4):
                 user = await memory_db.get_user(uid)
-                if now - user.last_greet >= greet_cd:
+                # last_greet is persisted, so it stays on wall-clock time
+                wall = time.time()
+                if wall - user.last_greet >= greet_cd:
                     # Update last_greet
-                    user.last_greet = now
+                    user.last_greet = wall
                     await memory_db.save_user(user)
                     
-                    await bucket.take()
-                    if time.time() < next_allowed_global:
-                        await asyncio.sleep(max(0.01, next_allowed_global - time.time()))
+                    await wait_global_slot()
                     if batcher:
                         await batcher.add(f"{nick} sagt hallo", uid=uid)
-                    next_allowed_global = time.time() + global_cd
-                    per_user_until_local[uid] = time.time() + per_user_cd
+                    done = clock()
+                    next_allowed_global = done + global_cd
+                    per_user_until_local[uid] = done + per_user_cd
                     quick = True
             
             if quick:
@@ -337,36 +465,47 @@ async def process_comments(
             
             # Handle thanks
             if resp_thanks and scorer.is_thanks(txt):
-                await bucket.take()
-                if time.time() < next_allowed_global:
-                    await asyncio.sleep(max(0.01, next_allowed_global - time.time()))
+                await wait_global_slot()
                 if batcher:
                     await batcher.add(f"{nick} bedankt sich", uid=uid)
-                next_allowed_global = time.time() + global_cd
-                per_user_until_local[uid] = time.time() + per_user_cd
+                done = clock()
+                next_allowed_global = done + global_cd
+                per_user_until_local[uid] = done + per_user_cd
                 continue
             
             # Handle high-relevance comments
             if score >= reply_threshold:
-                await bucket.take()
-                if time.time() < next_allowed_global:
-                    await asyncio.sleep(max(0.01, next_allowed_global - time.time()))
+                await wait_global_slot()
                 reply = await resp.reply_to_comment(nick, txt, uid)
                 if reply and batcher:
                     await batcher.add(f"@{nick}: {txt} → {reply}", uid=uid)
-                    next_allowed_global = time.time() + global_cd
-                    per_user_until_local[uid] = time.time() + per_user_cd
+                    done = clock()
+                    next_allowed_global = done + global_cd
+                    per_user_until_local[uid] = done + per_user_cd
         except Exception as e:
             log.error(f"process_comments Fehler: {e}")
 
 
+async def _forward_events(source: asyncio.Queue, merged: asyncio.Queue) -> None:
+    """
+    Move events from one per-type queue into the shared event queue.
+    
+    Args:
+        source: Per-type event queue filled by the TikTok listener
+        merged: Queue consumed by process_event_batch
+    """
+    while True:
+        evt = await source.get()
+        await merged.put(evt)
+
+
 async def process_event_batch(
     cfg: Dict[str, Any],
     memory_db: MemoryDB,
     batcher: OutboxBatcher,
-    viewers: Dict[str, Dict],
-    greet_tasks: Dict[str, asyncio.Task],
-    pending_joins: Set[str]
+    viewers: Dict[str, Viewer],
+    greeter: GreetingScheduler,
+    pending_joins: PendingJoins
 ) -> None:
     """
     Process batched events from TikTok.
@@ -376,81 +515,99 @@ async def process_event_batch(
         memory_db: MemoryDB instance
         batcher: OutboxBatcher instance
         viewers: Active viewers dictionary
-        greet_tasks: Active greeting tasks
+        greeter: Delayed join greeting scheduler
         pending_joins: Pending join announcements
     """
     event_priority = cfg.get("event_priority", {
         "gift": 3, "follow": 2, "subscribe": 3, "share": 2, "like": 1, "join": 1
     })
+    join_enabled = bool(int(cfg.get("join_rules", {}).get("enabled", 1)))
+    
+    # Handlers record the event and return the outbox line, if any
+    async def on_gift(evt, uid: str, nick: str) -> Optional[str]:
+        gname = getattr(evt.gift, "name", "Gift")
+        count = int(getattr(evt, "repeat_count", getattr(evt.gift, "repeat_count", 1)) or 1)
+        await memory_db.remember_event(uid, nickname=nick, gift_inc=count)
+        return f"{nick} sent {gname} x{count}"
+    
+    async def on_join(evt, uid: str, nick: str) -> Optional[str]:
+        await memory_db.remember_event(uid, nickname=nick, join=True)
+        if join_enabled:
+            greeter.schedule(uid)
+            pending_joins.add(nick)
+        return None
+    
+    async def on_follow(evt, uid: str, nick: str) -> Optional[str]:
+        await memory_db.remember_event(uid, nickname=nick, follow=True)
+        return f"{nick} followed"
+    
+    async def on_share(evt, uid: str, nick: str) -> Optional[str]:
+        await memory_db.remember_event(uid, nickname=nick, share=True)
+        return f"{nick} shared"
+    
+    async def on_subscribe(evt, uid: str, nick: str) -> Optional[str]:
+        await memory_db.remember_event(uid, nickname=nick, sub=True)
+        return f"{nick} subscribed"
+    
+    async def on_like(evt, uid: str, nick: str) -> Optional[str]:
+        # Bursts arrive already summed and filtered by like_threshold
+        count = evt.count
+        await memory_db.remember_event(uid, nickname=nick, like_inc=count)
+        return f"{nick} liked x{count}"
+    
+    # Event class -> (handler, priority), resolved once instead of per event
+    handlers = {
+        GiftEvent: (on_gift, event_priority.get("gift", 1)),
+        JoinEvent: (on_join, event_priority.get("join", 1)),
+        FollowEvent: (on_follow, event_priority.get("follow", 1)),
+        ShareEvent: (on_share, event_priority.get("share", 1)),
+        SubscribeEvent: (on_subscribe, event_priority.get("subscribe", 1)),
+        LikeBurst: (on_like, event_priority.get("like", 1)),
+    }
+    
+    # One long-lived forwarder per queue instead of six get() tasks per turn
+    merged: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAX)
+    forwarders = [
+        asyncio.create_task(_forward_events(q, merged))
+        for q in (gift_queue, join_queue, follow_queue, share_queue, subscribe_queue, like_queue)
+    ]
     
-    while True:
-        try:
-            tasks = [
-                asyncio.create_task(gift_queue.get()),
-                asyncio.create_task(join_queue.get()),
-                asyncio.create_task(follow_queue.get()),
-                asyncio.create_task(share_queue.get()),
-                asyncio.create_task(subscribe_queue.get()),
-                asyncio.create_task(like_queue.get())
-            ]
-            
-            done, pending = await asyncio.wait(tasks, timeout=0.2, return_when=asyncio.FIRST_COMPLETED)
-            
-            for t in pending:
-                t.cancel()
+    try:
+        while True:
+            # Block for one event, then drain whatever else is already waiting
+            events = [await merged.get()]
+            while len(events) < EVENT_BATCH_MAX and not merged.empty():
+                events.append(merged.get_nowait())
             
-            for t in done:
+            lines: List[Tuple[str, int, str]] = []
+            for evt in events:
                 try:
-                    evt = t.result()
-                    uid = getattr(evt.user, "uniqueId", "") or getattr(evt.user, "id", "")
+                    entry = handlers.get(type(evt))
+                    if entry is None:
+                        continue
+                    
+                    uid = _uid(evt.user)
                     if not uid:
                         continue
                     
-                    nick = getattr(evt.user, "nickname", "") or uid
+                    nick = _nick(evt.user, uid)
                     touch_viewer(viewers, uid, nick)
                     
-                    # Determine event type and priority
-                    evt_type = type(evt).__name__.replace("Event", "").lower()
-                    priority = event_priority.get(evt_type, 1)
-                    
-                    if isinstance(evt, GiftEvent):
-                        gname = getattr(evt.gift, "name", "Gift")
-                        count = int(getattr(evt, "repeat_count", getattr(evt.gift, "repeat_count", 1)) or 1)
-                        await memory_db.remember_event(uid, nickname=nick, gift_inc=count)
-                        if batcher:
-                            await batcher.add(f"{nick} sent {gname} x{count}", priority=priority, uid=uid)
-                    elif isinstance(evt, JoinEvent):
-                        await memory_db.remember_event(uid, nickname=nick, join=True)
-                        if int(cfg.get("join_rules", {}).get("enabled", 1)):
-                            if uid not in greet_tasks:
-                                greet_tasks[uid] = asyncio.create_task(
-                                    schedule_greeting(uid, viewers, greet_tasks, pending_joins, memory_db, cfg)
-                                )
-                            pending_joins.add(nick)
-                    elif isinstance(evt, FollowEvent):
-                        await memory_db.remember_event(uid, nickname=nick, follow=True)
-                        if batcher:
-                            await batcher.add(f"{nick} followed", priority=priority, uid=uid)
-                    elif isinstance(evt, ShareEvent):
-                        await memory_db.remember_event(uid, nickname=nick, share=True)
-                        if batcher:
-                            await batcher.add(f"{nick} shared", priority=priority, uid=uid)
-                    elif isinstance(evt, SubscribeEvent):
-                        await memory_db.remember_event(uid, nickname=nick, sub=True)
-                        if batcher:
-                            await batcher.add(f"{nick} subscribed", priority=priority, uid=uid)
-                    elif isinstance(evt, LikeEvent):
-                        count = int(getattr(evt, "count", 1))
-                        if count >= int(cfg.get("like_threshold", 20)):
-                            await memory_db.remember_event(uid, nickname=nick, like_inc=count)
-                            if batcher:
-                                await batcher.add(f"{nick} liked x{count}", priority=priority, uid=uid)
+                    handler, priority = entry
+                    text = await handler(evt, uid, nick)
+                    if text:
+                        lines.append((text, priority, uid))
                 except Exception as e:
                     log.error(f"Error processing event: {e}")
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            log.error(f"process_event_batch Fehler: {e}")
+            
+            if lines and batcher:
+                try:
+                    await batcher.add_many(lines)
+                except Exception as e:
+                    log.error(f"Error batching events: {e}")
+    finally:
+        for t in forwarders:
+            t.cancel()
 
 
 async def join_announcer_worker(cfg: Dict[str, Any], batcher: OutboxBatcher, speech: SpeechState, mic: MicState) -> None:
@@ -465,39 +622,40 @@ async def join_announcer_worker(cfg: Dict[str, Any], batcher: OutboxBatcher, spe
     """
     global LAST_JOIN_ANNOUNCE_TS, PENDING_JOINS, LAST_OUTPUT_TS
     
+    idle_need = int(cfg.get("join_rules", {}).get("min_idle_since_last_output_sec", 25))
+    gcd = int(cfg.get("join_rules", {}).get("greet_global_cooldown_sec", 180))
+    
+    if not batcher:
+        return
+    
+    # Sleep until the next condition can change instead of polling every second
     while True:
-        await asyncio.sleep(1.0)
-        
-        if not batcher:
-            continue
-        if speech.is_speaking() or mic.is_active():
-            continue
-        if not PENDING_JOINS:
+        await PENDING_JOINS.wait()
+        await speech.wait_idle()
+        if mic.is_active():
+            await asyncio.sleep(MIC_RECHECK_S)
             continue
         
-        idle_need = int(cfg.get("join_rules", {}).get("min_idle_since_last_output_sec", 25))
-        gcd = int(cfg.get("join_rules", {}).get("greet_global_cooldown_sec", 180))
-        
-        if (time.time() - LAST_OUTPUT_TS) < idle_need:
-            continue
-        if (time.time() - LAST_JOIN_ANNOUNCE_TS) < gcd:
+        wait = max(LAST_OUTPUT_TS + idle_need, LAST_JOIN_ANNOUNCE_TS + gcd) - time.monotonic()
+        if wait > 0:
+            # Output may happen meanwhile and push the deadline; the next turn re-checks
+            await asyncio.sleep(wait)
             continue
         
-        names = list(PENDING_JOINS)[:20]
-        for n in names:
-            PENDING_JOINS.discard(n)
+        names = PENDING_JOINS.take(20)
         
         if names:
             joined_chunk = ", ".join(names)
             await batcher.add(f"Neu dabei: {joined_chunk}")
-            LAST_JOIN_ANNOUNCE_TS = time.time()
+            LAST_JOIN_ANNOUNCE_TS = time.monotonic()
 
 
 async def tiktok_listener(
     cfg: Dict[str, Any],
     memory_db: MemoryDB,
     deduper: EventDeduper,
-    viewers: Dict[str, Dict]
+    viewers: Dict[str, Viewer],
+    scorer: Relevance
 ) -> None:
     """
     Listen to TikTok live events.
@@ -507,6 +665,7 @@ async def tiktok_listener(
         memory_db: MemoryDB instance
         deduper: EventDeduper instance
         viewers: Active viewers dictionary
+        scorer: Relevance scorer shared with process_comments
     """
     sess = cfg["tiktok"].get("session_id") or ""
     client = TikTokLiveClient(unique_id=cfg["tiktok"]["unique_id"])
@@ -525,7 +684,14 @@ async def tiktok_listener(
     
     comment_cfg = cfg.get("comment", {})
     min_len = int(comment_cfg.get("min_length", 3))
-    scorer = Relevance(comment_cfg)
+    follow_cd = int(comment_cfg.get("global_cooldown", 6))
+    is_ignored = scorer.is_ignored
+    
+    # Per-viewer like sums for the current window: uid -> [user, count]
+    loop = asyncio.get_running_loop()
+    like_threshold = int(cfg.get("like_threshold", 20))
+    like_accum: Dict[str, list] = {}
+    like_flush: Optional[asyncio.TimerHandle] = None
     
     @client.on(ConnectEvent)
     async def on_connect(evt: ConnectEvent):
@@ -536,21 +702,23 @@ async def tiktok_listener(
         try:
             txt = (evt.comment or "").strip()
             low = txt.lower()
-            if len(low) < min_len or scorer.is_ignored(low):
+            if len(low) < min_len or is_ignored(low):
                 return
             
-            uid = getattr(evt.user, "uniqueId", "") or getattr(evt.user, "id", "")
+            uid = _uid(evt.user)
             if not uid:
                 return
             
-            nick = getattr(evt.user, "nickname", "") or uid
+            nick = _nick(evt.user, uid)
             sig = make_signature("comment", uid, low)
-            if await deduper.seen(sig):
+            if deduper.seen(sig):
                 return
             
             touch_viewer(viewers, uid, nick)
             await memory_db.remember_event(uid, nickname=nick, message=txt)
-            await comment_queue.put({"uid": uid, "nick": nick, "text": low})
+            if not _offer(comment_queue, {"uid": uid, "nick": nick, "text": low}):
+                log.debug(f"Kommentar-Queue voll, verworfen: {nick}")
+                return
             log.info(f"TikTok Kommentar von {nick}: {txt}")
         except Exception as e:
             log.error(f"Error processing comment: {e}")
@@ -558,9 +726,9 @@ async def tiktok_listener(
     @client.on(GiftEvent)
     async def on_gift(evt: GiftEvent):
         try:
-            uid = getattr(evt.user, "uniqueId", "") or getattr(evt.user, "id", "")
+            uid = _uid(evt.user)
             sig = make_signature("gift", uid, getattr(evt.gift, "name", "Gift"), getattr(evt, "repeat_count", 1))
-            if await deduper.seen(sig):
+            if deduper.seen(sig):
                 return
             await gift_queue.put(evt)
         except Exception as e:
@@ -570,61 +738,81 @@ async def tiktok_listener(
     async def on_follow(evt: FollowEvent):
         try:
             now = time.time()
-            if now - getattr(on_follow, "_last", 0) < int(cfg.get("comment", {}).get("global_cooldown", 6)):
+            if now - getattr(on_follow, "_last", 0) < follow_cd:
                 return
             setattr(on_follow, "_last", now)
             
-            uid = getattr(evt.user, "uniqueId", "") or getattr(evt.user, "id", "")
+            uid = _uid(evt.user)
             sig = make_signature("follow", uid)
-            if await deduper.seen(sig):
+            if deduper.seen(sig):
                 return
-            await follow_queue.put(evt)
+            _offer(follow_queue, evt)
         except Exception as e:
             log.error(f"Error processing follow: {e}")
     
     @client.on(SubscribeEvent)
     async def on_subscribe(evt: SubscribeEvent):
         try:
-            uid = getattr(evt.user, "uniqueId", "") or getattr(evt.user, "id", "")
+            uid = _uid(evt.user)
             sig = make_signature("subscribe", uid)
-            if await deduper.seen(sig):
+            if deduper.seen(sig):
                 return
             await subscribe_queue.put(evt)
         except Exception as e:
             log.error(f"Error processing subscribe: {e}")
     
+    def flush_likes() -> None:
+        nonlocal like_flush
+        like_flush = None
+        for user, count in like_accum.values():
+            if count >= like_threshold:
+                # Likes are the flood case; drop them rather than wait
+                _offer(like_queue, LikeBurst(user, count))
+        like_accum.clear()
+    
     @client.on(LikeEvent)
     async def on_like(evt: LikeEvent):
+        nonlocal like_flush
         try:
-            await like_queue.put(evt)
+            uid = _uid(evt.user)
+            if not uid:
+                return
+            count = int(getattr(evt, "count", 1))
+            entry = like_accum.get(uid)
+            if entry is None:
+                like_accum[uid] = [evt.user, count]
+            else:
+                entry[1] += count
+            if like_flush is None:
+                like_flush = loop.call_later(LIKE_WINDOW_S, flush_likes)
         except Exception as e:
             log.error(f"Error processing like: {e}")
     
     @client.on(ShareEvent)
     async def on_share(evt: ShareEvent):
         try:
-            uid = getattr(evt.user, "uniqueId", "") or getattr(evt.user, "id", "")
+            uid = _uid(evt.user)
             sig = make_signature("share", uid)
-            if await deduper.seen(sig):
+            if deduper.seen(sig):
                 return
-            await share_queue.put(evt)
+            _offer(share_queue, evt)
         except Exception as e:
             log.error(f"Error processing share: {e}")
     
     @client.on(JoinEvent)
     async def on_join(evt: JoinEvent):
         try:
-            uid = getattr(evt.user, "uniqueId", "") or getattr(evt.user, "id", "")
+            uid = _uid(evt.user)
             if not uid:
                 return
             
-            nick = getattr(evt.user, "nickname", "") or uid
+            nick = _nick(evt.user, uid)
             sig = make_signature("join", uid)
-            if await deduper.seen(sig):
+            if deduper.seen(sig):
                 return
             
             touch_viewer(viewers, uid, nick)
-            await join_queue.put(evt)
+            _offer(join_queue, evt)
         except Exception as e:
             log.error(f"Error processing join: {e}")
     
@@ -676,27 +864,29 @@ async def clean_memory_periodic(memory_db: MemoryDB, decay_days: int) -> None:
             log.error(f"Memory cleanup Fehler: {e}")
 
 
-async def start_all(cfg: Dict[str, Any], gui=None) -> None:
+async def start_all(cfg: Dict[str, Any], gui=None, level_cb: Optional[Callable[[float], None]] = None) -> None:
     """
     Start all application components.
     
     Args:
         cfg: Configuration dictionary
         gui: Optional GUI instance for callbacks
+        level_cb: Optional microphone level callback used when there is no GUI
     """
-    global viewers, greet_tasks, PENDING_JOINS
+    global viewers, PENDING_JOINS
     global message_queue, comment_queue, gift_queue, like_queue
     global join_queue, follow_queue, share_queue, subscribe_queue
     
     # Initialize asyncio queues in the current event loop
-    message_queue = asyncio.Queue[str]()
-    comment_queue = asyncio.Queue[dict]()
-    gift_queue = asyncio.Queue()
-    like_queue = asyncio.Queue()
-    join_queue = asyncio.Queue()
-    follow_queue = asyncio.Queue()
-    share_queue = asyncio.Queue()
-    subscribe_queue = asyncio.Queue()
+    # Gifts and subscriptions block their producer when full; the rest drop
+    message_queue = asyncio.Queue[str](maxsize=MESSAGE_QUEUE_MAX)
+    comment_queue = asyncio.Queue[dict](maxsize=COMMENT_QUEUE_MAX)
+    gift_queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAX)
+    like_queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAX)
+    join_queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAX)
+    follow_queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAX)
+    share_queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAX)
+    subscribe_queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAX)
     
     # Initialize state
     speech = SpeechState()
@@ -717,8 +907,7 @@ async def start_all(cfg: Dict[str, Any], gui=None) -> None:
     deduper = EventDeduper(int(cfg.get("dedupe_ttl", 600)))
     
     viewers = {}
-    greet_tasks = {}
-    PENDING_JOINS = set()
+    PENDING_JOINS = PendingJoins()
     
     # Initialize TTS and Audio managers if enabled
     tts_manager = None
@@ -753,14 +942,16 @@ async def start_all(cfg: Dict[str, Any], gui=None) -> None:
             log.error(f"Failed to initialize TTS/Audio: {e}")
             log.warning("Falling back to Animaze WebSocket mode")
             tts_manager = None
+            if audio_manager:
+                audio_manager.close()
             audio_manager = None
     
     # Start microphone monitor if enabled
     micmon = None
     mic_enabled = int(cfg.get("microphone", {}).get("enabled", 1))
     if mic_enabled:
-        def vu_cb(level):
-            pass
+        # The VU meter (Tk or web) is driven by level pushes from the audio thread
+        vu_cb = gui.post_mic_level if gui else level_cb
         
         micmon = MicrophoneMonitor(cfg, mic, level_cb=vu_cb)
         mic_device = str(cfg.get("microphone", {}).get("device", "")).strip()
@@ -792,16 +983,27 @@ async def start_all(cfg: Dict[str, Any], gui=None) -> None:
     asyncio.create_task(clean_memory_periodic(memory_db, mem_cfg.get("decay_days", 90)))
     asyncio.create_task(batcher.worker())
     asyncio.create_task(join_announcer_worker(cfg, batcher, speech, mic))
-    asyncio.create_task(process_comments(cfg, memory_db, batcher, viewers))
-    asyncio.create_task(process_event_batch(cfg, memory_db, batcher, viewers, greet_tasks, PENDING_JOINS))
+    # One scorer (regexes, keyword sets, sentiment lexicon) for both comment paths
+    scorer = Relevance(cfg.get("comment", {}))
+    asyncio.create_task(process_comments(cfg, memory_db, batcher, viewers, scorer))
+    greeter = GreetingScheduler(viewers, PENDING_JOINS, memory_db, cfg)
+    asyncio.create_task(greeter.run())
+    asyncio.create_task(process_event_batch(cfg, memory_db, batcher, viewers, greeter, PENDING_JOINS))
     
     # Start TikTok listener
-    await tiktok_listener(cfg, memory_db, deduper, viewers)
+    try:
+        await tiktok_listener(cfg, memory_db, deduper, viewers, scorer)
+    finally:
+        # Commit events still held in the write-behind buffer
+        await memory_db.close()
+        if audio_manager:
+            audio_manager.close()
 
 
 def main():
     """Main entry point for the legacy Tkinter GUI."""
     cfg = load_settings()
+    install_event_loop_policy()
     app = ConfigGUI(cfg, start_all)
     app.mainloop()
 
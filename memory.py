@@ -3,18 +3,127 @@ Memory module with SQLite backend for storing and managing user interaction hist
 """
 
 import asyncio
-import json
+import atexit
 import logging
 import os
 import time
 import warnings
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 
 import aiosqlite
 from pydantic import BaseModel, Field
 
+from utils import JSONDecodeError, json_dumpb, json_dumps, json_loads
+
 log = logging.getLogger("ChatPalBrain")
 
+# Applied to file databases: WAL with NORMAL sync fsyncs on checkpoint, not on every commit
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Counter events touch a handful of columns; apply them in place instead of
+# loading, validating and rewriting the whole row
+UPSERT_EVENT_SQL = """
+    INSERT INTO users (uid, first_seen, last_seen, nickname, likes, gifts, follows, subs, shares, joins)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(uid) DO UPDATE SET
+        last_seen = excluded.last_seen,
+        nickname = CASE WHEN excluded.nickname != '' THEN excluded.nickname ELSE users.nickname END,
+        likes = users.likes + excluded.likes,
+        gifts = users.gifts + excluded.gifts,
+        follows = users.follows + excluded.follows,
+        subs = users.subs + excluded.subs,
+        shares = users.shares + excluded.shares,
+        joins = users.joins + excluded.joins
+"""
+
+# Message history lives in its own table so an append writes one row
+# instead of re-encoding the whole list
+INSERT_MESSAGE_SQL = "INSERT INTO user_messages (uid, ts, msg) VALUES (?, ?, ?)"
+
+# Keep only the newest ?2 messages of user ?1
+TRIM_MESSAGES_SQL = """
+    DELETE FROM user_messages WHERE uid = ?1 AND rowid NOT IN (
+        SELECT rowid FROM user_messages WHERE uid = ?1
+        ORDER BY ts DESC, rowid DESC LIMIT ?2
+    )
+"""
+
+SELECT_MESSAGES_SQL = """
+    SELECT msg FROM user_messages WHERE uid = ?
+    ORDER BY ts DESC, rowid DESC LIMIT ?
+"""
+
+# One-time move of histories stored by older versions in users.messages
+MIGRATE_MESSAGES_SQL = """
+    INSERT INTO user_messages (uid, ts, msg)
+    SELECT users.uid, users.last_seen, j.value
+    FROM users, json_each(users.messages) AS j
+    WHERE users.messages != '[]'
+    ORDER BY users.uid, j.key
+"""
+
+MERGE_BACKGROUND_SQL = "UPDATE users SET background = json_patch(background, ?) WHERE uid = ?"
+
+# background_fmt caches format_background(background) for prompt assembly
+SELECT_BACKGROUNDS_SQL = "SELECT uid, background FROM users WHERE uid IN (SELECT value FROM json_each(?))"
+
+SET_BACKGROUND_FMT_SQL = "UPDATE users SET background_fmt = ? WHERE uid = ?"
+
+SELECT_BACKGROUND_FMT_SQL = "SELECT background_fmt FROM users WHERE uid = ?"
+
+INSERT_USER_SQL = "INSERT OR IGNORE INTO users (uid, first_seen, last_seen) VALUES (?, ?, ?)"
+
+SELECT_USER_SQL = "SELECT * FROM users WHERE uid = ?"
+
+SAVE_USER_SQL = """
+    INSERT OR REPLACE INTO users (
+        uid, first_seen, last_seen, nickname, likes, gifts,
+        follows, subs, shares, joins, last_greet, background, background_fmt
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# RETURNING (SQLite 3.35+) yields the removed uids from the same index scan
+DELETE_OLD_USERS_SQL = "DELETE FROM users WHERE last_seen < ? RETURNING uid"
+
+DELETE_USER_MESSAGES_SQL = "DELETE FROM user_messages WHERE uid = ?"
+
+COUNT_USERS_SQL = "SELECT COUNT(*) FROM users"
+
+# sqlite3 keeps prepared statements in a per-connection LRU keyed by SQL text;
+# size it well above the number of distinct statements above
+SQLITE_STATEMENT_CACHE = 256
+
+
+def format_background(bg: Dict[str, Any]) -> str:
+    """
+    Format background facts as "key=value, key=value" for prompts.
+    
+    Empty keys and values are skipped and values longer than 48 characters
+    are truncated with an ellipsis.
+    
+    Args:
+        bg: Background dictionary
+    
+    Returns:
+        Formatted background information string
+    """
+    parts = []
+    for k, v in bg.items():
+        if v is None:
+            continue
+        ks = str(k).strip()
+        vs = str(v).strip()
+        if not ks or not vs:
+            continue
+        parts.append(f"{ks}={vs[:48]}…" if len(vs) > 48 else f"{ks}={vs}")
+    return ", ".join(parts)
+
 
 async def extract_and_store_entities(text: str, uid: str, memory_db, openai_client) -> None:
     """
@@ -27,7 +136,7 @@ async def extract_and_store_entities(text: str, uid: str, memory_db, openai_clie
         text: User message text
         uid: User ID
         memory_db: MemoryDB instance
-        openai_client: OpenAI client instance
+        openai_client: AsyncOpenAI client instance
     """
     try:
         # Use LLM to extract structured information
@@ -39,33 +148,26 @@ Return a JSON object with keys for any entities found (e.g., {{"pet": "dog named
 If no entities found, return {{}}.
 Only return the JSON, no other text."""
         
-        response = await asyncio.to_thread(
-            openai_client.chat.completions.create,
+        response = await openai_client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "You are a data extraction assistant. Extract personal information from user messages."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.0,
-            max_tokens=150
+            max_tokens=150,
+            # JSON mode always returns a bare object, never a fenced code block
+            response_format={"type": "json_object"}
         )
         
-        result_text = response.choices[0].message.content.strip()
-        
-        # Try to parse JSON response
-        # Remove markdown code blocks if present
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-        
-        entities = json.loads(result_text)
+        entities = json_loads(response.choices[0].message.content)
         
         if entities:
             # Update user background with extracted entities
             await memory_db.update_background(uid, entities)
             log.info(f"Extracted entities for user {uid}: {entities}")
-    except json.JSONDecodeError as e:
+    except JSONDecodeError as e:
+        # Only possible when the reply was cut off at max_tokens
         log.debug(f"Failed to parse entity extraction response: {e}")
     except Exception as e:
         log.warning(f"Entity extraction failed: {e}")
@@ -88,8 +190,60 @@ class UserModel(BaseModel):
     background: Dict[str, Any] = Field(default_factory=dict)
 
 
+class _UserDelta:
+    """Changes for one user that remember_event has accepted but not yet written."""
+    
+    __slots__ = (
+        'first_seen', 'last_seen', 'nickname', 'likes', 'gifts', 'follows',
+        'subs', 'shares', 'joins', 'messages', 'background'
+    )
+    
+    def __init__(self, now: float) -> None:
+        self.first_seen = now
+        self.last_seen = now
+        self.nickname = ""
+        self.likes = 0
+        self.gifts = 0
+        self.follows = 0
+        self.subs = 0
+        self.shares = 0
+        self.joins = 0
+        self.messages: List[Tuple[float, str]] = []
+        self.background: Dict[str, Any] = {}
+    
+    def absorb_older(self, older: "_UserDelta", history: int) -> None:
+        """
+        Fold in a delta recorded before this one, e.g. a batch whose flush failed.
+        
+        Args:
+            older: Earlier delta for the same user
+            history: Maximum number of messages to keep
+        """
+        self.first_seen = min(self.first_seen, older.first_seen)
+        if not self.nickname:
+            self.nickname = older.nickname
+        self.likes += older.likes
+        self.gifts += older.gifts
+        self.follows += older.follows
+        self.subs += older.subs
+        self.shares += older.shares
+        self.joins += older.joins
+        self.messages = (older.messages + self.messages)[-history:]
+        self.background = {**older.background, **self.background}
+
+
 class MemoryDB:
-    """Async SQLite database for user memory management."""
+    """
+    Async SQLite database for user memory management.
+    
+    remember_event() is write-behind: changes are coalesced per user and
+    committed together every FLUSH_INTERVAL seconds, or sooner once
+    FLUSH_MAX_USERS users are pending. Every read flushes first, so callers
+    always see their own writes.
+    """
+    
+    FLUSH_INTERVAL = 0.5
+    FLUSH_MAX_USERS = 200
     
     def __init__(self, db_path: str = "memory.db", per_user_history: int = 10):
         """
@@ -103,12 +257,20 @@ class MemoryDB:
         self.per_user_history = per_user_history
         self._conn: Optional[aiosqlite.Connection] = None
         self._lock = asyncio.Lock()
+        self._pending: Dict[str, _UserDelta] = {}
+        self._flush_wake: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closing = False
     
     async def initialize(self) -> None:
         """Initialize database connection and create tables."""
-        self._conn = await aiosqlite.connect(self.db_path)
+        self._conn = await aiosqlite.connect(self.db_path, cached_statements=SQLITE_STATEMENT_CACHE)
         self._conn.row_factory = aiosqlite.Row
         
+        if self.db_path != ":memory:":
+            for pragma in SQLITE_PRAGMAS:
+                await self._conn.execute(pragma)
+        
         await self._conn.execute("""
             CREATE TABLE IF NOT EXISTS users (
                 uid TEXT PRIMARY KEY,
@@ -123,19 +285,151 @@ class MemoryDB:
                 joins INTEGER DEFAULT 0,
                 messages TEXT DEFAULT '[]',
                 last_greet REAL DEFAULT 0.0,
-                background TEXT DEFAULT '{}'
+                background TEXT DEFAULT '{}',
+                background_fmt TEXT DEFAULT ''
+            )
+        """)
+        
+        # Databases created before background_fmt existed get the column and a backfill
+        cursor = await self._conn.execute("SELECT 1 FROM pragma_table_info('users') WHERE name = 'background_fmt'")
+        if await cursor.fetchone() is None:
+            await self._conn.execute("ALTER TABLE users ADD COLUMN background_fmt TEXT DEFAULT ''")
+            cursor = await self._conn.execute("SELECT uid, background FROM users WHERE background != '{}'")
+            await self._conn.executemany(SET_BACKGROUND_FMT_SQL, [
+                (format_background(json_loads(bg)), uid) for uid, bg in await cursor.fetchall()
+            ])
+        await self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS user_messages (
+                uid TEXT NOT NULL,
+                ts REAL NOT NULL,
+                msg TEXT NOT NULL
             )
         """)
+        # clean_old_users filters on last_seen
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_users_last_seen ON users(last_seen)"
+        )
+        # History reads walk this index newest first; rowid breaks ties
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_user_messages_uid_ts ON user_messages(uid, ts)"
+        )
+        
+        cursor = await self._conn.execute(MIGRATE_MESSAGES_SQL)
+        if cursor.rowcount > 0:
+            await self._conn.execute("UPDATE users SET messages = '[]' WHERE messages != '[]'")
+            log.info(f"Moved {cursor.rowcount} stored messages to user_messages")
         
         await self._conn.commit()
+        
+        self._closing = False
+        self._flush_wake = asyncio.Event()
+        self._flush_task = asyncio.create_task(self._flush_loop())
         log.info(f"MemoryDB initialized at {self.db_path}")
     
     async def close(self) -> None:
-        """Close database connection."""
+        """Write pending events and close database connection."""
+        if self._flush_task:
+            # Let the loop finish the batch it may be writing instead of cancelling
+            # it mid-commit, after the batch has already left _pending
+            task, self._flush_task = self._flush_task, None
+            self._closing = True
+            self._flush_wake.set()
+            await task
         if self._conn:
+            await self.flush()
             await self._conn.close()
             self._conn = None
     
+    async def flush(self) -> None:
+        """Write all pending remember_event changes in one transaction."""
+        async with self._lock:
+            await self._flush_locked()
+    
+    async def _flush_loop(self) -> None:
+        """Background task that commits pending events periodically."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wake.wait(), self.FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wake.clear()
+            try:
+                if self._pending:
+                    await self.flush()
+            except Exception as e:
+                # One failed flush must not stop the flusher
+                log.error(f"MemoryDB flush loop error: {e}")
+            if self._closing:
+                return
+    
+    async def _flush_locked(self) -> None:
+        """
+        Write pending events (internal method, assumes lock is held).
+        """
+        if not self._pending or self._conn is None:
+            return
+        # Swap first: remember_event never awaits, so new events land in the fresh dict
+        pending, self._pending = self._pending, {}
+        rows = []
+        messages = []
+        trims = []
+        merges = []
+        for uid, d in pending.items():
+            rows.append((
+                uid,
+                d.first_seen,
+                d.last_seen,
+                d.nickname,
+                d.likes,
+                d.gifts,
+                d.follows,
+                d.subs,
+                d.shares,
+                d.joins,
+            ))
+            if d.messages:
+                messages.extend((uid, ts, message) for ts, message in d.messages)
+                trims.append((uid, self.per_user_history))
+            if d.background:
+                merges.append((json_dumps(d.background), uid))
+        
+        # One executemany per statement is a single job on the aiosqlite thread
+        try:
+            await self._conn.executemany(UPSERT_EVENT_SQL, rows)
+            if messages:
+                await self._conn.executemany(INSERT_MESSAGE_SQL, messages)
+                await self._conn.executemany(TRIM_MESSAGES_SQL, trims)
+            if merges:
+                await self._conn.executemany(MERGE_BACKGROUND_SQL, merges)
+                await self._refresh_background_fmt([uid for _, uid in merges])
+            await self._conn.commit()
+        except Exception as e:
+            try:
+                await self._conn.rollback()
+            except Exception as rollback_error:
+                log.error(f"MemoryDB rollback failed: {rollback_error}")
+            # Put the batch back in front of anything recorded since, to retry next flush
+            for uid, d in pending.items():
+                newer = self._pending.get(uid)
+                if newer is not None:
+                    newer.absorb_older(d, self.per_user_history)
+                else:
+                    self._pending[uid] = d
+            log.error(f"MemoryDB flush failed, {len(pending)} users kept for retry: {e}")
+    
+    async def _refresh_background_fmt(self, uids: List[str]) -> None:
+        """
+        Recompute the cached background_fmt of users whose background changed
+        (internal method, assumes lock is held; the caller commits).
+        
+        Args:
+            uids: User IDs to refresh
+        """
+        cursor = await self._conn.execute(SELECT_BACKGROUNDS_SQL, (json_dumps(uids),))
+        await self._conn.executemany(SET_BACKGROUND_FMT_SQL, [
+            (format_background(json_loads(bg)), uid) for uid, bg in await cursor.fetchall()
+        ])
+    
     async def get_user(self, uid: str) -> UserModel:
         """
         Get or create a user record.
@@ -147,53 +441,66 @@ class MemoryDB:
             UserModel object
         """
         async with self._lock:
-            return await self._get_user_unlocked(uid)
+            await self._flush_locked()
+            # Rows come from our own typed schema; skip re-validating every field
+            return UserModel.model_construct(**await self._get_user_unlocked(uid))
     
-    async def _get_user_unlocked(self, uid: str) -> UserModel:
+    async def _get_user_unlocked(self, uid: str) -> Dict[str, Any]:
         """
         Get or create a user record (internal method, assumes lock is held).
         
+        Rows come from our own typed schema, so they are returned as plain
+        dicts; only get_user() wraps them in a UserModel for callers.
+        
         Args:
             uid: User unique ID
         
         Returns:
-            UserModel object
+            User record as a dict with decoded messages and background
         """
-        cursor = await self._conn.execute(
-            "SELECT * FROM users WHERE uid = ?", (uid,)
-        )
+        cursor = await self._conn.execute(SELECT_USER_SQL, (uid,))
         row = await cursor.fetchone()
         
         if row:
             # Convert row to dict and parse JSON fields
             user_dict = dict(row)
-            user_dict['messages'] = json.loads(user_dict['messages'])
-            user_dict['background'] = json.loads(user_dict['background'])
-            return UserModel(**user_dict)
-        else:
-            # Create new user
-            now = time.time()
-            new_user = UserModel(
-                uid=uid,
-                first_seen=now,
-                last_seen=now
-            )
-            await self._save_user(new_user)
-            return new_user
+            del user_dict['background_fmt']
+            cursor = await self._conn.execute(SELECT_MESSAGES_SQL, (uid, self.per_user_history))
+            user_dict['messages'] = [m for (m,) in reversed(await cursor.fetchall())]
+            user_dict['background'] = json_loads(user_dict['background'])
+            return user_dict
+        
+        # Create new user with the column defaults
+        now = time.time()
+        await self._conn.execute(INSERT_USER_SQL, (uid, now, now))
+        await self._conn.commit()
+        return {
+            'uid': uid,
+            'first_seen': now,
+            'last_seen': now,
+            'nickname': "",
+            'likes': 0,
+            'gifts': 0,
+            'follows': 0,
+            'subs': 0,
+            'shares': 0,
+            'joins': 0,
+            'messages': [],
+            'last_greet': 0.0,
+            'background': {},
+        }
     
     async def _save_user(self, user: UserModel) -> None:
         """
         Save user to database (internal method, assumes lock is held).
         
+        Message history is append-only through remember_event() and is
+        not rewritten here.
+        
         Args:
             user: UserModel to save
         """
-        await self._conn.execute("""
-            INSERT OR REPLACE INTO users (
-                uid, first_seen, last_seen, nickname, likes, gifts,
-                follows, subs, shares, joins, messages, last_greet, background
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        await self._conn.execute(SAVE_USER_SQL, (
             user.uid,
             user.first_seen,
             user.last_seen,
@@ -204,9 +511,9 @@ class MemoryDB:
             user.subs,
             user.shares,
             user.joins,
-            json.dumps(user.messages),
             user.last_greet,
-            json.dumps(user.background)
+            json_dumps(user.background),
+            format_background(user.background)
         ))
         await self._conn.commit()
     
@@ -218,6 +525,7 @@ class MemoryDB:
             user: UserModel to save
         """
         async with self._lock:
+            await self._flush_locked()
             await self._save_user(user)
     
     async def remember_event(
@@ -249,33 +557,29 @@ class MemoryDB:
             message: Message text to store
             background: Background information to update
         """
-        async with self._lock:
-            user = await self._get_user_unlocked(uid)
-            user.last_seen = time.time()
-            
-            if nickname:
-                user.nickname = nickname
-            if like_inc:
-                user.likes += like_inc
-            if gift_inc:
-                user.gifts += gift_inc
-            if follow:
-                user.follows += 1
-            if sub:
-                user.subs += 1
-            if share:
-                user.shares += 1
-            if join:
-                user.joins += 1
-            if message:
-                # Maintain max history
-                user.messages.append(message)
-                if len(user.messages) > self.per_user_history:
-                    user.messages = user.messages[-self.per_user_history:]
-            if background:
-                user.background.update(background)
-            
-            await self._save_user(user)
+        now = time.time()
+        d = self._pending.get(uid)
+        if d is None:
+            d = self._pending[uid] = _UserDelta(now)
+        d.last_seen = now
+        
+        if nickname:
+            d.nickname = nickname
+        d.likes += int(like_inc)
+        d.gifts += int(gift_inc)
+        d.follows += int(follow)
+        d.subs += int(sub)
+        d.shares += int(share)
+        d.joins += int(join)
+        if message:
+            d.messages.append((now, message))
+            if len(d.messages) > self.per_user_history:
+                del d.messages[0]
+        if background:
+            d.background.update(background)
+        
+        if len(self._pending) >= self.FLUSH_MAX_USERS and self._flush_wake is not None:
+            self._flush_wake.set()
     
     async def update_background(self, uid: str, entities: Dict[str, Any]) -> None:
         """
@@ -285,40 +589,34 @@ class MemoryDB:
             uid: User unique ID
             entities: Dictionary of extracted entities/facts
         """
+        if not entities:
+            return
+        now = time.time()
         async with self._lock:
-            user = await self._get_user_unlocked(uid)
-            user.background.update(entities)
-            await self._save_user(user)
+            await self._flush_locked()
+            await self._conn.execute(INSERT_USER_SQL, (uid, now, now))
+            await self._conn.execute(MERGE_BACKGROUND_SQL, (json_dumps(entities), uid))
+            await self._refresh_background_fmt([uid])
+            await self._conn.commit()
     
     async def get_background_info(self, uid: str) -> str:
         """
         Get formatted background information for a user.
         
+        The string is precomputed whenever the background changes, so this
+        is a single column read.
+        
         Args:
             uid: User unique ID
         
         Returns:
             Formatted background information string
         """
-        user = await self.get_user(uid)
-        bg = user.background
-        if not bg:
-            return ""
-        
-        parts = []
-        for k, v in bg.items():
-            if v is None:
-                continue
-            ks = str(k).strip()
-            vs = str(v).strip()
-            if not ks or not vs:
-                continue
-            truncated = vs[:48]
-            if len(vs) > 48:
-                truncated += "…"
-            parts.append(f"{ks}={truncated}")
-        
-        return ", ".join(parts)
+        async with self._lock:
+            await self._flush_locked()
+            cursor = await self._conn.execute(SELECT_BACKGROUND_FMT_SQL, (uid,))
+            row = await cursor.fetchone()
+        return row[0] if row and row[0] else ""
     
     async def clean_old_users(self, decay_days: int) -> int:
         """
@@ -334,18 +632,15 @@ class MemoryDB:
         cutoff = time.time() - decay_sec
         
         async with self._lock:
-            cursor = await self._conn.execute(
-                "SELECT COUNT(*) FROM users WHERE last_seen < ?", (cutoff,)
-            )
-            count_row = await cursor.fetchone()
-            count = count_row[0] if count_row else 0
+            await self._flush_locked()
+            cursor = await self._conn.execute(DELETE_OLD_USERS_SQL, (cutoff,))
+            removed = await cursor.fetchall()
             
-            await self._conn.execute(
-                "DELETE FROM users WHERE last_seen < ?", (cutoff,)
-            )
+            if removed:
+                await self._conn.executemany(DELETE_USER_MESSAGES_SQL, [(row[0],) for row in removed])
             await self._conn.commit()
             
-            return count
+            return len(removed)
     
     async def get_user_count(self) -> int:
         """
@@ -354,12 +649,23 @@ class MemoryDB:
         Returns:
             Number of users
         """
-        cursor = await self._conn.execute("SELECT COUNT(*) FROM users")
+        async with self._lock:
+            await self._flush_locked()
+        cursor = await self._conn.execute(COUNT_USERS_SQL)
         row = await cursor.fetchone()
         return row[0] if row else 0
 
 
 # Legacy function wrappers for backward compatibility
+
+# Legacy remember_event rewrites the whole file at most this often (seconds)
+LEGACY_SAVE_INTERVAL = 2.0
+
+# Memory dict and path with changes not yet written by the legacy functions
+_dirty: Optional[tuple] = None
+_last_save = float("-inf")
+
+
 def load_memory(path: str, decay_days: int) -> Dict[str, Any]:
     """
     Legacy function for loading memory from JSON (deprecated).
@@ -380,8 +686,8 @@ def load_memory(path: str, decay_days: int) -> Dict[str, Any]:
         return {"users": {}, "created": time.time()}
     
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            mem = json.load(f)
+        with open(path, "rb") as f:
+            mem = json_loads(f.read())
         
         # Remove stale user data
         decay_sec = decay_days * 86400
@@ -394,7 +700,7 @@ def load_memory(path: str, decay_days: int) -> Dict[str, Any]:
         
         log.info(f"Loaded memory with {len(mem['users'])} users")
         return mem
-    except json.JSONDecodeError as e:
+    except JSONDecodeError as e:
         log.error(f"Memory file corrupt: {e}. Creating new memory.")
         return {"users": {}, "created": time.time()}
     except Exception as e:
@@ -415,15 +721,53 @@ def save_memory(mem: Dict[str, Any], path: str) -> None:
         DeprecationWarning,
         stacklevel=2
     )
+    _write_memory(mem, path)
+
+
+def _write_memory(mem: Dict[str, Any], path: str) -> None:
+    """
+    Atomically write memory to JSON and clear the pending-changes marker.
+    
+    Args:
+        mem: Memory dictionary to save
+        path: Path to memory file
+    """
+    global _dirty, _last_save
+    _dirty = None
+    _last_save = time.monotonic()
     try:
+        data = json_dumpb(mem)
         tmp = f"{path}.tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(mem, f, indent=2, ensure_ascii=False)
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
         os.replace(tmp, path)
+        _fsync_dir(os.path.dirname(os.path.abspath(path)))
     except Exception as e:
         log.error(f"Failed to save memory: {e}")
 
 
+def _fsync_dir(path: str) -> None:
+    """
+    Flush a directory entry so a completed rename survives a crash.
+    
+    Args:
+        path: Directory to sync
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened for syncing on Windows
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 def get_user(memory: Dict[str, Any], uid: str, per_user_history: int) -> Dict[str, Any]:
     """
     Legacy function for getting user (deprecated).
@@ -530,10 +874,20 @@ def remember_event(
     if background:
         u["background"].update(background)
     
-    try:
-        save_memory(memory, mem_cfg.get("file", "memory.json"))
-    except (IOError, OSError) as e:
-        log.error(f"Failed to save memory: {e}")
+    # Bursts of events collapse into one rewrite; flush_memory() writes the rest
+    global _dirty
+    _dirty = (memory, mem_cfg.get("file", "memory.json"))
+    if time.monotonic() - _last_save >= LEGACY_SAVE_INTERVAL:
+        _write_memory(*_dirty)
+
+
+def flush_memory() -> None:
+    """Write changes recorded by the legacy remember_event() that are still pending."""
+    if _dirty is not None:
+        _write_memory(*_dirty)
+
+
+atexit.register(flush_memory)
 
 
 def get_background_info(memory: Dict[str, Any], uid: str) -> str:
@@ -553,21 +907,4 @@ def get_background_info(memory: Dict[str, Any], uid: str) -> str:
         stacklevel=2
     )
     u = memory["users"].get(uid, {})
-    bg = u.get("background", {})
-    if not bg:
-        return ""
-    
-    parts = []
-    for k, v in bg.items():
-        if v is None:
-            continue
-        ks = str(k).strip()
-        vs = str(v).strip()
-        if not ks or not vs:
-            continue
-        truncated = vs[:48]
-        if len(vs) > 48:
-            truncated += "…"
-        parts.append(f"{ks}={truncated}")
-    
-    return ", ".join(parts)
+    return format_background(u.get("background", {}))
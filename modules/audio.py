@@ -11,9 +11,43 @@ import numpy as np
 import sounddevice as sd
 import soundfile as sf
 
+try:
+    from scipy.signal import resample_poly
+except ImportError:  # pragma: no cover - scipy is optional, linear interpolation is used instead
+    resample_poly = None
+
 log = logging.getLogger("ChatPalBrain")
 
 
+def resample(audio_data: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """
+    Resample audio to the output stream rate.
+    
+    Args:
+        audio_data: Samples as a (frames,) or (frames, channels) array
+        src_rate: Sample rate of audio_data
+        dst_rate: Sample rate to convert to
+    
+    Returns:
+        Resampled float32 samples with the same channel layout
+    """
+    if src_rate == dst_rate or len(audio_data) == 0:
+        return audio_data
+    if resample_poly is not None:
+        g = np.gcd(int(src_rate), int(dst_rate))
+        out = resample_poly(audio_data, dst_rate // g, src_rate // g, axis=0)
+        return out.astype(np.float32, copy=False)
+    
+    n_out = int(round(len(audio_data) * dst_rate / src_rate))
+    src_t = np.arange(len(audio_data), dtype=np.float64)
+    dst_t = np.linspace(0, len(audio_data) - 1, n_out)
+    if audio_data.ndim == 1:
+        return np.interp(dst_t, src_t, audio_data).astype(np.float32)
+    return np.stack(
+        [np.interp(dst_t, src_t, audio_data[:, c]) for c in range(audio_data.shape[1])], axis=1
+    ).astype(np.float32)
+
+
 class AudioManager:
     """
     Manages audio device selection and playback for TTS output.
@@ -34,6 +68,7 @@ class AudioManager:
         self.output_device = audio_cfg.get("output_device", None)
         if self.output_device == "":
             self.output_device = None
+        self._device_idx = self._resolve_device(self.output_device)
         
         # Playback settings
         self.sample_rate = int(audio_cfg.get("sample_rate", 44100))
@@ -43,8 +78,90 @@ class AudioManager:
         self._playing = False
         self._play_lock = asyncio.Lock()
         
+        # One long-lived stream; opening PortAudio per utterance costs 50-200ms
+        self._stream: Optional[sd.OutputStream] = None
+        self._open_stream()
+        
         log.info(f"AudioManager initialized (device={self.output_device}, rate={self.sample_rate})")
     
+    def _resolve_device(self, device: Optional[str]) -> Optional[int]:
+        """
+        Resolve a configured device name or index to a PortAudio index once.
+        
+        Names match exactly first, then case-insensitively as a substring,
+        among output devices only.
+        
+        Args:
+            device: Device name or index (None for default)
+        
+        Returns:
+            Device index, or None for the default output device
+        """
+        if device is None:
+            return None
+        try:
+            return int(device)
+        except (ValueError, TypeError):
+            pass
+        
+        try:
+            outputs = [
+                (i, dev["name"])
+                for i, dev in enumerate(sd.query_devices())
+                if dev["max_output_channels"] > 0
+            ]
+        except Exception as e:
+            log.error(f"Failed to query audio devices, using default output: {e}")
+            return None
+        
+        wanted = str(device).strip()
+        for i, name in outputs:
+            if name == wanted:
+                return i
+        wanted = wanted.lower()
+        for i, name in outputs:
+            if wanted in name.lower():
+                return i
+        
+        log.warning(f"Audio output device '{device}' not found, using default output")
+        return None
+    
+    def _open_stream(self) -> Optional[sd.OutputStream]:
+        """
+        (Re)open the output stream on the configured device.
+        
+        Returns:
+            The started stream, or None if it could not be opened
+        """
+        self.close()
+        device = self._device_idx
+        
+        try:
+            stream = sd.OutputStream(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                device=device,
+                dtype='float32'
+            )
+            stream.start()
+        except Exception as e:
+            log.error(f"Failed to open audio output stream on {device}: {e}")
+            return None
+        
+        self._stream = stream
+        return stream
+    
+    def close(self) -> None:
+        """Stop and close the output stream."""
+        stream, self._stream = self._stream, None
+        if stream is None:
+            return
+        try:
+            stream.stop()
+            stream.close()
+        except Exception as e:
+            log.warning(f"Error closing audio output stream: {e}")
+    
     def list_devices(self) -> list:
         """
         List all available audio devices.
@@ -72,6 +189,9 @@ class AudioManager:
         """
         Play audio data to the configured output device.
         
+        Audio in another sample rate is resampled to the stream rate rather
+        than reopening the stream.
+        
         Args:
             audio_data: Audio samples as numpy array
             sample_rate: Sample rate of the audio
@@ -80,40 +200,52 @@ class AudioManager:
             try:
                 self._playing = True
                 
+                # The stream takes float32 in [-1, 1]; scale integer PCM by its full
+                # range (2**15 for int16, as soundfile does)
+                if np.issubdtype(audio_data.dtype, np.signedinteger):
+                    full_scale = -float(np.iinfo(audio_data.dtype).min)
+                    audio_data = audio_data.astype(np.float32) / full_scale
+                elif np.issubdtype(audio_data.dtype, np.unsignedinteger):
+                    # Unsigned PCM (8-bit WAV) is centred on the midpoint
+                    half = (float(np.iinfo(audio_data.dtype).max) + 1) / 2
+                    audio_data = (audio_data.astype(np.float32) - half) / half
+                
                 # Prepare audio data
                 if audio_data.ndim == 1:
-                    # Mono to stereo if needed
+                    # Mono to stereo if needed (one contiguous copy)
                     if self.channels == 2:
-                        audio_data = np.stack([audio_data, audio_data], axis=1)
+                        audio_data = np.repeat(audio_data.reshape(-1, 1), 2, axis=1)
                 elif audio_data.ndim == 2:
                     # Ensure correct number of channels
                     if audio_data.shape[1] != self.channels:
                         if self.channels == 1:
-                            # Stereo to mono
-                            audio_data = np.mean(audio_data, axis=1)
+                            # Stereo to mono in one fused pass; mean() only for wider layouts.
+                            # Sum in float32 so integer PCM cannot overflow.
+                            if audio_data.shape[1] == 2:
+                                audio_data = audio_data.astype(np.float32, copy=False)
+                                audio_data = (audio_data[:, 0] + audio_data[:, 1]) * 0.5
+                            else:
+                                audio_data = np.mean(audio_data, axis=1)
                         else:
                             # Mono to stereo
-                            audio_data = np.stack([audio_data[:, 0], audio_data[:, 0]], axis=1)
+                            audio_data = np.repeat(audio_data[:, :1], 2, axis=1)
+                
+                stream = self._stream or self._open_stream()
+                if stream is None:
+                    raise RuntimeError("no audio output stream")
                 
-                # Play audio
-                device = self.output_device
-                if device is not None:
-                    try:
-                        # Try to parse as integer device index
-                        device = int(device)
-                    except (ValueError, TypeError):
-                        # Keep as string device name
-                        pass
+                audio_data = resample(audio_data.astype(np.float32, copy=False), sample_rate, self.sample_rate)
                 
-                # Use blocking play for simplicity
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: sd.play(audio_data, samplerate=sample_rate, device=device, blocking=True)
+                # write() blocks until the samples are queued on the device
+                await asyncio.get_running_loop().run_in_executor(
+                    None, stream.write, np.ascontiguousarray(audio_data)
                 )
                 
-                log.info(f"Audio playback completed ({len(audio_data)/sample_rate:.2f}s)")
+                log.info(f"Audio playback completed ({len(audio_data)/self.sample_rate:.2f}s)")
             except Exception as e:
                 log.error(f"Audio playback error: {e}")
+                # Drop a broken stream so the next utterance reopens it
+                self.close()
             finally:
                 self._playing = False
     
@@ -148,4 +280,6 @@ class AudioManager:
             device: Device name or index (None for default)
         """
         self.output_device = device
-        log.info(f"Audio output device set to: {device}")
+        self._device_idx = self._resolve_device(device)
+        if self._open_stream() is not None:
+            log.info(f"Audio output device set to: {device}")
@@ -5,7 +5,7 @@ Outbox batching module for grouping messages before sending.
 import asyncio
 import logging
 import time
-from typing import Callable, List, Optional, NamedTuple
+from typing import Callable, Iterable, List, Optional, NamedTuple, Tuple
 
 log = logging.getLogger("ChatPalBrain")
 
@@ -69,28 +69,49 @@ class OutboxBatcher:
             return
         
         async with self._lock:
-            # Smart merge: if last message has same uid and priority, merge them
-            if uid and self.buffer and self.buffer[-1].uid == uid and self.buffer[-1].priority == priority:
-                last_item = self.buffer[-1]
-                merged_text = f"{last_item.text} {text.strip()}"
-                self.buffer[-1] = BatchItem(priority=priority, text=merged_text, uid=uid)
-                log.info(f"Batch merge (uid={uid}): {merged_text}")
-            else:
-                # Add as new item
-                self.buffer.append(BatchItem(priority=priority, text=text.strip(), uid=uid))
-                log.info(f"Batch add (priority={priority}, uid={uid}): {text}")
-            
-            if self.first_ts is None:
-                self.first_ts = time.time()
-            
-            # Sort by priority (higher priority first), keeping uid info
-            self.buffer.sort(key=lambda x: x.priority, reverse=True)
-            
-            # Check if we need to flush
-            texts = [item.text for item in self.buffer]
-            joined = self.sep.join(texts)
-            if len(joined) > self.max_chars or len(self.buffer) >= self.max_items:
-                await self._flush_locked()
+            await self._add_locked(text, priority, uid)
+    
+    async def add_many(self, items: Iterable[Tuple[str, int, Optional[str]]]) -> None:
+        """
+        Add several messages while taking the lock only once.
+        
+        Each item is handled exactly as add() would, including merging and
+        flushing when a limit is reached.
+        
+        Args:
+            items: (text, priority, uid) tuples
+        """
+        async with self._lock:
+            for text, priority, uid in items:
+                if text:
+                    await self._add_locked(text, priority, uid)
+    
+    async def _add_locked(self, text: str, priority: int, uid: Optional[str]) -> None:
+        """
+        Add a message to the batch (must be called while holding lock).
+        """
+        # Smart merge: if last message has same uid and priority, merge them
+        if uid and self.buffer and self.buffer[-1].uid == uid and self.buffer[-1].priority == priority:
+            last_item = self.buffer[-1]
+            merged_text = f"{last_item.text} {text.strip()}"
+            self.buffer[-1] = BatchItem(priority=priority, text=merged_text, uid=uid)
+            log.info(f"Batch merge (uid={uid}): {merged_text}")
+        else:
+            # Add as new item
+            self.buffer.append(BatchItem(priority=priority, text=text.strip(), uid=uid))
+            log.info(f"Batch add (priority={priority}, uid={uid}): {text}")
+        
+        if self.first_ts is None:
+            self.first_ts = time.time()
+        
+        # Sort by priority (higher priority first), keeping uid info
+        self.buffer.sort(key=lambda x: x.priority, reverse=True)
+        
+        # Check if we need to flush
+        texts = [item.text for item in self.buffer]
+        joined = self.sep.join(texts)
+        if len(joined) > self.max_chars or len(self.buffer) >= self.max_items:
+            await self._flush_locked()
     
     async def worker(self) -> None:
         """
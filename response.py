@@ -214,6 +214,8 @@ class ResponseEngine:
         self.cfg = cfg
         self.memory_db = memory_db
         self.openai_client = openai.OpenAI(api_key=cfg["openai"]["api_key"])
+        # Background entity extraction awaits this directly instead of borrowing a worker thread
+        self.async_openai_client = openai.AsyncOpenAI(api_key=cfg["openai"]["api_key"])
         self.system_prompt = cfg.get("system_prompt", "")
         self.timeout = float(cfg.get("openai", {}).get("request_timeout", 10.0))
         
@@ -280,7 +282,7 @@ class ResponseEngine:
         # Extract and store entities from user message (async, non-blocking for response)
         try:
             from memory import extract_and_store_entities
-            asyncio.create_task(extract_and_store_entities(text, uid, self.memory_db, self.openai_client))
+            asyncio.create_task(extract_and_store_entities(text, uid, self.memory_db, self.async_openai_client))
         except Exception as e:
             log.debug(f"Entity extraction task creation failed: {e}")
         
@@ -3,17 +3,31 @@ Settings module for handling configuration loading, saving, and management.
 Supports both JSON (legacy) and YAML formats for better readability.
 """
 
+import copy
+import glob
+import hashlib
 import json
 import logging
 import os
-from typing import Any, Dict
+import pickle  # nosec B403 - only loads cache files written by this module
+from typing import Any, Dict, Optional, Tuple
 
 import yaml
 
+# Prefer the libyaml C bindings; fall back to the pure-Python implementation
+try:
+    from yaml import CSafeLoader as YAMLLoader, CSafeDumper as YAMLDumper
+except ImportError:
+    from yaml import SafeLoader as YAMLLoader, SafeDumper as YAMLDumper
+
 log = logging.getLogger("ChatPalBrain")
 
 SETTINGS_FILE_JSON = "settings.json"
 SETTINGS_FILE_YAML = "settings.yaml"
+SETTINGS_CACHE_DIR = ".cache"
+
+# Parsed settings keyed by (path, mtime_ns, size) of the YAML file they came from
+_settings_cache: Dict[str, Any] = {"key": None, "cfg": None}
 
 DEFAULT_SETTINGS: Dict[str, Any] = {
     "tiktok": {"unique_id": "@PupCid", "session_id": ""},
@@ -150,22 +164,129 @@ def _merge_settings(base: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str,
     return base
 
 
+def _settings_file_key(path: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Build a cache key identifying the current on-disk version of a settings file.
+    
+    Args:
+        path: Path to settings file
+    
+    Returns:
+        Tuple of (absolute path, mtime in ns, size) or None if the file is missing
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def _parsed_cache_path(raw: bytes) -> str:
+    """
+    Get the binary cache file path for a given settings file content.
+    
+    Args:
+        raw: Raw bytes of the YAML settings file
+    
+    Returns:
+        Path of the pickle holding the parsed content
+    """
+    digest = hashlib.blake2b(raw, digest_size=8).hexdigest()
+    return os.path.join(SETTINGS_CACHE_DIR, f"settings.{digest}.pkl")
+
+
+def _parse_settings_yaml(raw: bytes) -> Any:
+    """
+    Parse YAML settings, reusing a pickled result for identical content.
+    
+    Args:
+        raw: Raw bytes of the YAML settings file
+    
+    Returns:
+        Parsed settings
+    """
+    cache_path = _parsed_cache_path(raw)
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)  # nosec B301 - written by _parse_settings_yaml
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        log.debug(f"Ignoring unreadable settings cache {cache_path}: {e}")
+    
+    cfg = yaml.load(raw, Loader=YAMLLoader)  # nosec B506 - safe loader
+    
+    try:
+        os.makedirs(SETTINGS_CACHE_DIR, exist_ok=True)
+        tmp = f"{cache_path}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(cfg, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+    except Exception as e:
+        log.debug(f"Failed to write settings cache {cache_path}: {e}")
+    return cfg
+
+
+def _purge_parsed_cache(keep: Optional[str] = None) -> None:
+    """
+    Remove stale binary settings caches.
+    
+    Args:
+        keep: Cache file path to leave in place
+    """
+    for path in glob.glob(os.path.join(SETTINGS_CACHE_DIR, "settings.*.pkl")):
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def settings_version() -> Optional[Tuple[str, int, int]]:
+    """
+    Identify the current version of the YAML settings file.
+    
+    Returns:
+        Tuple of (absolute path, mtime in ns, size) or None if there is no YAML file
+    """
+    return _settings_file_key(SETTINGS_FILE_YAML)
+
+
+def invalidate_settings_cache() -> None:
+    """Drop the cached settings so the next load_settings() re-reads the file."""
+    _settings_cache["key"] = None
+    _settings_cache["cfg"] = None
+
+
 def load_settings() -> Dict[str, Any]:
     """
     Load settings from file, preferring YAML over JSON.
     Falls back to defaults if file doesn't exist or is corrupt.
     
+    The parsed YAML settings are cached in memory and only re-read when the
+    file's mtime or size changes. Callers receive a private copy. Across
+    restarts, unchanged file content is served from a pickle in
+    SETTINGS_CACHE_DIR instead of being parsed again.
+    
     Returns:
         Configuration dictionary with all settings
     """
     # Try YAML first (preferred format)
-    if os.path.isfile(SETTINGS_FILE_YAML):
+    key = _settings_file_key(SETTINGS_FILE_YAML)
+    if key is not None and key == _settings_cache["key"]:
+        return copy.deepcopy(_settings_cache["cfg"])
+    
+    if key is not None:
         try:
-            with open(SETTINGS_FILE_YAML, "r", encoding="utf-8") as f:
-                cfg = yaml.safe_load(f)
+            with open(SETTINGS_FILE_YAML, "rb") as f:
+                cfg = _parse_settings_yaml(f.read())
             log.info(f"Loaded settings from {SETTINGS_FILE_YAML}")
             merged = _merge_settings(json.loads(json.dumps(DEFAULT_SETTINGS)), cfg)
             save_settings(merged)
+            # Key on the file as rewritten by save_settings()
+            _settings_cache["key"] = _settings_file_key(SETTINGS_FILE_YAML)
+            _settings_cache["cfg"] = copy.deepcopy(merged)
             return merged
         except yaml.YAMLError as e:
             log.error(f"YAML settings file corrupt: {e}. Trying JSON fallback.")
@@ -200,9 +321,17 @@ def save_settings(cfg: Dict[str, Any]) -> None:
     Args:
         cfg: Configuration dictionary to save
     """
+    invalidate_settings_cache()
     try:
-        with open(SETTINGS_FILE_YAML, "w", encoding="utf-8") as f:
-            yaml.dump(cfg, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        raw = yaml.dump(
+            cfg, Dumper=YAMLDumper, default_flow_style=False, allow_unicode=True, sort_keys=False
+        ).encode("utf-8")
+        with open(SETTINGS_FILE_YAML, "wb") as f:
+            f.write(raw)
         log.info(f"Settings saved to {SETTINGS_FILE_YAML}")
     except Exception as e:
         log.error(f"Failed to save settings: {e}")
+        return
+    
+    # Keep the cache entry only if it still matches the file content
+    _purge_parsed_cache(keep=_parsed_cache_path(raw))
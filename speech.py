@@ -139,6 +139,8 @@ class MicrophoneMonitor:
     Monitors microphone input and detects voice activity.
     """
     
+    LEVEL_SMOOTHING = 0.1  # EMA weight of the newest block in the reported level
+    
     def __init__(self, cfg: dict, mic_state: MicState, level_cb=None) -> None:
         """
         Initialize microphone monitor.
@@ -175,13 +177,16 @@ class MicrophoneMonitor:
         try:
             data = np.asarray(indata, dtype=np.float32)
             if data.ndim > 1:
-                data = np.mean(data, axis=1)
-            rms = float(np.sqrt(np.mean(np.square(data)))) if data.size else 0.0
-            self._level = rms
+                # The stream is mono, so this is normally a view rather than a downmix copy
+                data = data[:, 0] if data.shape[1] == 1 else data.mean(axis=1)
+            # dot() sums the squares without allocating a squared copy of the block
+            rms = float(np.sqrt(np.dot(data, data) / data.size)) if data.size else 0.0
+            # Smoothed level for display; voice detection below uses the raw RMS
+            self._level += self.LEVEL_SMOOTHING * (rms - self._level)
             
             if self._level_cb:
                 try:
-                    self._level_cb(rms)
+                    self._level_cb(self._level)
                 except Exception:
                     pass
             
@@ -251,6 +256,6 @@ class MicrophoneMonitor:
         Get current microphone level.
         
         Returns:
-            Current RMS level
+            Current RMS level, smoothed with an exponential moving average
         """
         return self._level
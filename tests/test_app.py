@@ -113,3 +113,138 @@ def test_paths_with_api_in_middle_serve_index(client):
     response = client.get('/user/socket.io/data')
     assert response.status_code == 200
     assert b'Test SPA' in response.data
+
+
+def test_status_serializes_log_buffer(client):
+    """Test that the bounded log buffer is returned as a JSON list."""
+    from app import app_state
+    
+    client.get('/api/status')
+    # Log appends do not invalidate the cached state but still show up
+    app_state['logs'].append({'timestamp': 0.0, 'level': 'INFO', 'message': 'status test'})
+    
+    response = client.get('/api/status')
+    assert response.status_code == 200
+    logs = response.json['data']['logs']
+    assert isinstance(logs, list)
+    assert any(entry['message'] == 'status test' for entry in logs)
+
+
+def test_devices_are_cached_until_refresh(client, monkeypatch):
+    """Test that audio devices are enumerated once and re-queried on refresh."""
+    import sys
+    import types
+    import app as app_module
+    
+    calls = []
+    
+    def query_devices():
+        calls.append(1)
+        return [{'name': 'Mic', 'max_input_channels': 1}, {'name': 'Speaker', 'max_input_channels': 0}]
+    
+    monkeypatch.setitem(sys.modules, 'sounddevice', types.SimpleNamespace(query_devices=query_devices))
+    monkeypatch.setitem(app_module._device_cache, 'devices', None)
+    
+    first = client.get('/api/devices')
+    second = client.get('/api/devices')
+    assert first.json['data'] == [{'id': 0, 'name': 'Mic', 'channels': 1}]
+    assert second.json['data'] == first.json['data']
+    assert len(calls) == 1
+    
+    assert client.post('/api/devices/refresh').status_code == 200
+    assert len(calls) == 2
+
+
+def test_status_reflects_state_updates(client):
+    """Test that the cached status body is rebuilt after state changes."""
+    from app import broadcast_stats_update
+    
+    broadcast_stats_update({'viewers': 1})
+    assert client.get('/api/status').json['data']['stats']['viewers'] == 1
+    
+    broadcast_stats_update({'viewers': 2})
+    assert client.get('/api/status').json['data']['stats']['viewers'] == 2
+
+
+def test_hashed_assets_are_cached_long_term(client):
+    """Test that content-hashed build assets get a long max-age."""
+    import app as app_module
+    
+    assets_dir = os.path.join(app_module.app.static_folder, 'assets')
+    os.makedirs(assets_dir)
+    with open(os.path.join(assets_dir, 'index-abc123.js'), 'w') as f:
+        f.write('// hashed bundle')
+    
+    response = client.get('/assets/index-abc123.js')
+    assert response.status_code == 200
+    assert response.cache_control.max_age == app_module.IMMUTABLE_ASSET_MAX_AGE
+
+
+def test_precompressed_variant_served_when_accepted(client):
+    """Test that a .gz sibling is sent when the client accepts gzip."""
+    import gzip
+    import app as app_module
+    
+    with open(os.path.join(app_module.app.static_folder, 'bundle.js.gz'), 'wb') as f:
+        f.write(gzip.compress(b'// Test static file'))
+    with open(os.path.join(app_module.app.static_folder, 'bundle.js'), 'w') as f:
+        f.write('// Test static file')
+    
+    response = client.get('/bundle.js', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'javascript' in response.content_type
+    assert gzip.decompress(response.data) == b'// Test static file'
+    
+    plain = client.get('/bundle.js')
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.data == b'// Test static file'
+
+
+def test_import_settings_accepts_yaml_upload(client, monkeypatch):
+    """Test that uploaded YAML bytes are parsed and saved."""
+    import io
+    import app as app_module
+    
+    saved = []
+    monkeypatch.setattr(app_module, 'save_settings', saved.append)
+    
+    data = {'file': (io.BytesIO('tiktok:\n  unique_id: "@Grüße"\n'.encode('utf-8')), 'settings.yaml')}
+    response = client.post('/api/settings/import', data=data, content_type='multipart/form-data')
+    
+    assert response.status_code == 200
+    assert saved == [{'tiktok': {'unique_id': '@Grüße'}}]
+
+
+def test_defaults_support_conditional_requests(client):
+    """Test that /api/defaults sends an ETag and honours If-None-Match."""
+    response = client.get('/api/defaults')
+    assert response.status_code == 200
+    assert response.json['success'] is True
+    assert 'tiktok' in response.json['data']
+    
+    etag = response.headers['ETag']
+    cached = client.get('/api/defaults', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+
+
+def test_mic_level_emits_window_peak(monkeypatch):
+    """Test that mic levels are coalesced to the window peak and flushed once."""
+    import app as app_module
+    
+    emitted = []
+    monkeypatch.setattr(app_module.socketio, 'emit', lambda event, data: emitted.append((event, data)))
+    monkeypatch.setattr(app_module.socketio, 'start_background_task', lambda fn: None)
+    monkeypatch.setattr(app_module, '_mic_window', {'peak': 0.0, 'dirty': False, 'started': False})
+    
+    for level in (0.2, 0.9, 0.4):
+        app_module.broadcast_mic_level(level)
+    app_module._emit_mic_peak()
+    app_module._emit_mic_peak()
+    
+    assert emitted == [('mic_level', {'level': 0.9})]
+    assert app_module.app_state['mic_level'] == 0.9
+    
+    app_module.broadcast_mic_level(0.1)
+    app_module._emit_mic_peak()
+    assert emitted[-1] == ('mic_level', {'level': 0.1})
@@ -0,0 +1,67 @@
+"""
+Tests for TTS audio playback (modules/audio.py)
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("soundfile")
+try:
+    from modules.audio import AudioManager
+except OSError:  # sounddevice raises OSError when the PortAudio library is missing
+    pytest.skip("PortAudio library not available", allow_module_level=True)
+
+
+class FakeStream:
+    """Output stream stand-in that records written blocks."""
+    
+    def __init__(self):
+        self.written = []
+    
+    def write(self, data):
+        self.written.append(np.array(data))
+    
+    def stop(self):
+        pass
+    
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def audio_manager(monkeypatch):
+    """AudioManager at 24 kHz writing to a FakeStream instead of a device."""
+    monkeypatch.setattr(AudioManager, "_open_stream", lambda self: None)
+    mgr = AudioManager({"audio": {"sample_rate": 24000, "channels": 1}})
+    mgr._stream = FakeStream()
+    return mgr
+
+
+@pytest.mark.asyncio
+async def test_play_audio_normalizes_int16(audio_manager):
+    """Test that integer PCM is scaled to float32 [-1, 1] before it reaches the stream."""
+    pcm = np.array([[30000, 30000], [-32768, -32768], [0, 0]], dtype=np.int16)
+    
+    await audio_manager.play_audio(pcm, 24000)
+    
+    written = audio_manager._stream.written[0]
+    assert written.dtype == np.float32
+    assert np.all(np.abs(written) <= 1.0)
+    assert written[0] == pytest.approx(30000 / 32768)
+    assert written[1] == -1.0
+
+
+@pytest.mark.asyncio
+async def test_play_audio_resamples_to_stream_rate(audio_manager):
+    """Test that audio in another sample rate is resampled instead of reopening the stream."""
+    await audio_manager.play_audio(np.zeros(12000, dtype=np.float32), 12000)
+    
+    assert len(audio_manager._stream.written[0]) == 24000
+
+
+@pytest.mark.asyncio
+async def test_play_audio_centres_unsigned_pcm(audio_manager):
+    """Test that 8-bit unsigned PCM is shifted to zero before scaling."""
+    await audio_manager.play_audio(np.array([0, 128, 255], dtype=np.uint8), 24000)
+    
+    written = audio_manager._stream.written[0]
+    assert written.tolist() == pytest.approx([-1.0, 0.0, 127 / 128])
@@ -0,0 +1,130 @@
+"""
+Tests for the GUI bootstrapper helpers (bootstrap_launcher.py)
+"""
+import hashlib
+import zipfile
+
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+import bootstrap_launcher
+from bootstrap_launcher import DiagnosticsLogger, extract_payload, probe_install_dir, sha256_file
+
+
+def test_sha256_file_matches_hashlib(tmp_path):
+    """Test that file hashing matches a direct hashlib digest."""
+    data = b"palfriend" * 300000
+    path = tmp_path / "palfriend.exe"
+    path.write_bytes(data)
+
+    assert sha256_file(str(path)) == hashlib.sha256(data).hexdigest()
+
+
+def test_sha256_file_chunked_fallback(tmp_path, monkeypatch):
+    """Test the readinto loop used for files too large to map."""
+    data = b"x" * (bootstrap_launcher.HASH_CHUNK_SIZE * 2 + 17)
+    path = tmp_path / "palfriend.exe"
+    path.write_bytes(data)
+    monkeypatch.setattr(bootstrap_launcher, "MMAP_HASH_LIMIT", 0)
+
+    assert sha256_file(str(path)) == hashlib.sha256(data).hexdigest()
+
+
+def test_sha256_file_empty(tmp_path):
+    """Test hashing an empty file."""
+    path = tmp_path / "empty.exe"
+    path.write_bytes(b"")
+
+    assert sha256_file(str(path)) == hashlib.sha256(b"").hexdigest()
+
+
+def test_sha256_file_reports_progress(tmp_path, monkeypatch):
+    """Test that the mapped fast path reports progress for every byte hashed."""
+    data = b"y" * (bootstrap_launcher.HASH_CHUNK_SIZE + 5)
+    path = tmp_path / "palfriend.exe"
+    path.write_bytes(data)
+    monkeypatch.setattr(bootstrap_launcher, "MMAP_PROGRESS_STEP", 4096)
+    seen = []
+
+    digest = sha256_file(str(path), progress=seen.append)
+
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert sum(seen) == len(data)
+    assert len(seen) == -(-len(data) // 4096)
+
+
+def test_diagnostics_logger_writes_in_background(tmp_path):
+    """Test that log lines reach the file through the flusher thread."""
+    logger = DiagnosticsLogger()
+    logger.log_file = str(tmp_path / "launcher.log")
+
+    logger.info("first")
+    logger.info("second")
+    logger.error("broken")
+    logger.flush()
+
+    lines = (tmp_path / "launcher.log").read_text(encoding="utf-8").splitlines()
+    assert [line.split("] ", 1)[1] for line in lines] == ["INFO: first", "INFO: second", "ERROR: broken"]
+
+    logger.info("last")
+    logger.close()
+    assert (tmp_path / "launcher.log").read_text(encoding="utf-8").endswith("INFO: last\n")
+    assert logger._flusher.is_alive() is False
+
+
+def test_probe_install_dir_existing(tmp_path):
+    """Test probing an existing install directory."""
+    info = probe_install_dir(str(tmp_path))
+
+    assert info.exists is True
+    assert info.free_bytes is not None and info.free_bytes >= 0
+    assert info.disk_error is None
+
+
+def test_probe_install_dir_missing(tmp_path):
+    """Test probing an install directory that has not been created yet."""
+    info = probe_install_dir(str(tmp_path / "PalFriend"))
+
+    assert info.exists is False
+    assert info.free_bytes is None
+    assert info.disk_error
+
+
+def test_extract_payload_from_zip(tmp_path):
+    """Test extracting a zipped payload, including empty files."""
+    archive = tmp_path / "palfriend_payload.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("palfriend.exe", b"MZ" * 1000)
+        zf.writestr("_internal/empty.txt", b"")
+        zf.writestr("_internal/", b"")
+    dest = tmp_path / "install" / "palfriend"
+
+    assert extract_payload(str(archive), str(dest)) == 2
+    assert (dest / "palfriend.exe").read_bytes() == b"MZ" * 1000
+    assert (dest / "_internal" / "empty.txt").read_bytes() == b""
+
+
+def test_extract_payload_from_directory(tmp_path):
+    """Test copying a payload directory tree."""
+    payload = tmp_path / "palfriend_payload"
+    (payload / "_internal").mkdir(parents=True)
+    (payload / "palfriend.exe").write_bytes(b"MZ")
+    (payload / "_internal" / "lib.dll").write_bytes(b"lib")
+    dest = tmp_path / "install" / "palfriend"
+    seen = []
+
+    assert extract_payload(str(payload), str(dest), progress=seen.append) == 2
+    assert (dest / "_internal" / "lib.dll").read_bytes() == b"lib"
+    assert seen == [1, 2]
+
+
+def test_extract_payload_rejects_escaping_paths(tmp_path):
+    """Test that archive members cannot be written outside the destination."""
+    archive = tmp_path / "evil.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("../outside.txt", b"x")
+
+    with pytest.raises(ValueError):
+        extract_payload(str(archive), str(tmp_path / "install"))
+    assert not (tmp_path / "outside.txt").exists()
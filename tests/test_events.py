@@ -1,8 +1,10 @@
 """
 Tests for Phase 4: Event Processing (events.py)
 """
+import asyncio
 import time
-from events import make_signature, touch_viewer
+from types import SimpleNamespace
+from events import EventDeduper, GreetingScheduler, PendingJoins, Viewer, make_signature, touch_viewer
 
 
 def test_make_signature():
@@ -17,8 +19,9 @@ def test_make_signature():
     # Different input should produce different signature
     assert sig1 != sig3
     
-    # Should return hex string
-    assert len(sig1) == 40  # SHA1 hex is 40 characters
+    # Should return a 64-bit integer
+    assert isinstance(sig1, int)
+    assert 0 <= sig1 < 2 ** 64
 
 
 def test_make_signature_prefix():
@@ -30,6 +33,19 @@ def test_make_signature_prefix():
     assert sig1 != sig2
 
 
+def test_make_signature_unique_id():
+    """Test that provider IDs are used directly as dedup keys."""
+    sig1 = make_signature("comment", "user1", "Hello", unique_id=7301)
+    sig2 = make_signature("comment", "user1", "Other", unique_id=7301)
+    
+    assert sig1 == sig2 == ("comment", 7301)
+    assert make_signature("gift", unique_id=7301) != sig1
+    
+    deduper = EventDeduper(ttl=600)
+    assert deduper.seen(sig1) is False
+    assert deduper.seen(sig2) is True
+
+
 def test_touch_viewer_creates_new():
     """Test creating new viewer entry."""
     viewers = {}
@@ -37,10 +53,10 @@ def test_touch_viewer_creates_new():
     result = touch_viewer(viewers, "user1", "John")
     
     assert "user1" in viewers
-    assert viewers["user1"]["nick"] == "John"
-    assert "joined" in viewers["user1"]
-    assert "last_active" in viewers["user1"]
-    assert viewers["user1"]["greeted"] is False
+    assert viewers["user1"].uid == "user1"
+    assert viewers["user1"].nick == "John"
+    assert viewers["user1"].joined == viewers["user1"].last_active
+    assert viewers["user1"].greeted is False
 
 
 def test_touch_viewer_updates_existing():
@@ -49,29 +65,151 @@ def test_touch_viewer_updates_existing():
     
     # Create viewer
     result1 = touch_viewer(viewers, "user1", "John")
-    time1 = result1["last_active"]
+    time1 = result1.last_active
     
     # Wait a bit
     time.sleep(0.1)
     
     # Update viewer
     result2 = touch_viewer(viewers, "user1", "Johnny")
-    time2 = result2["last_active"]
+    time2 = result2.last_active
     
     # Should have updated
-    assert viewers["user1"]["nick"] == "Johnny"
+    assert viewers["user1"].nick == "Johnny"
     assert time2 > time1
-    assert result2["joined"] == result1["joined"]  # Joined time unchanged
+    assert result2.joined == result1.joined  # Joined time unchanged
 
 
-def test_touch_viewer_returns_dict():
-    """Test that touch_viewer returns viewer dict."""
+def test_touch_viewer_returns_viewer():
+    """Test that touch_viewer returns the stored slotted viewer."""
     viewers = {}
     
     result = touch_viewer(viewers, "user1", "John")
     
-    assert isinstance(result, dict)
-    assert "nick" in result
-    assert "joined" in result
-    assert "last_active" in result
-    assert "greeted" in result
+    assert isinstance(result, Viewer)
+    assert result is viewers["user1"]
+    assert not hasattr(result, "__dict__")
+
+
+def test_deduper_detects_repeats():
+    """Test that a signature is reported as seen within the TTL."""
+    deduper = EventDeduper(ttl=600)
+    
+    assert deduper.seen("a") is False
+    assert deduper.seen("a") is True
+    assert deduper.seen("b") is False
+
+
+def test_deduper_expires_old_signatures(monkeypatch):
+    """Test that signatures are forgotten after the TTL."""
+    now = [1000.0]
+    monkeypatch.setattr("events.time.time", lambda: now[0])
+    deduper = EventDeduper(ttl=10)
+    
+    deduper.seen("a")
+    now[0] += 11
+    
+    assert deduper.seen("a") is False
+
+
+def test_deduper_evicts_oldest_when_full():
+    """Test that the store is trimmed to the newest entries."""
+    deduper = EventDeduper(ttl=600)
+    
+    for i in range(5001):
+        deduper.seen(f"sig{i}")
+    
+    assert len(deduper._store) == 4000
+    assert "sig0" not in deduper._store
+    assert "sig5000" in deduper._store
+
+
+class _FakeMemoryDB:
+    """Minimal MemoryDB stand-in that records lookups."""
+    
+    def __init__(self):
+        self.lookups = []
+        self.saved = []
+    
+    async def get_user(self, uid):
+        self.lookups.append(uid)
+        return SimpleNamespace(uid=uid, last_greet=0.0)
+    
+    async def save_user(self, user):
+        self.saved.append(user)
+
+
+def _greet(viewers, memory_db):
+    cfg = {"join_rules": {"greet_after_seconds": 0, "active_ttl_seconds": 45}}
+    pending = PendingJoins()
+    
+    async def run():
+        greeter = GreetingScheduler(viewers, pending, memory_db, cfg)
+        worker = asyncio.create_task(greeter.run())
+        greeter.schedule("user1")
+        greeter.schedule("user1")
+        await asyncio.sleep(0.05)
+        worker.cancel()
+    
+    asyncio.run(run())
+    return set(pending)
+
+
+def test_greeting_scheduler_queues_present_viewer():
+    """Test that a present viewer is greeted once."""
+    viewers = {}
+    touch_viewer(viewers, "user1", "John")
+    memory_db = _FakeMemoryDB()
+    
+    pending = _greet(viewers, memory_db)
+    
+    assert pending == {"John"}
+    assert viewers["user1"].greeted is True
+    assert memory_db.lookups == ["user1"]
+    assert len(memory_db.saved) == 1
+
+
+def test_greeting_scheduler_skips_db_for_departed_viewer():
+    """Test that inactive viewers are filtered out before the DB lookup."""
+    viewers = {}
+    touch_viewer(viewers, "user1", "John")
+    viewers["user1"].last_active -= 3600
+    memory_db = _FakeMemoryDB()
+    
+    pending = _greet(viewers, memory_db)
+    
+    assert pending == set()
+    assert memory_db.lookups == []
+
+
+def test_pending_joins_bounded_fifo():
+    """Test that pending joins keep insertion order and drop the oldest names."""
+    pending = PendingJoins(maxlen=3)
+    for nick in ("a", "b", "c", "a", "d"):
+        pending.add(nick)
+    
+    # "a" moved to the back on re-add, so "b" is the oldest and gets evicted
+    assert list(pending) == ["c", "a", "d"]
+    assert pending.take(2) == ["c", "a"]
+    assert list(pending) == ["d"]
+    
+    pending.discard("d")
+    pending.discard("missing")
+    assert not pending
+
+
+def test_pending_joins_wait_wakes_on_add():
+    """Test that wait() blocks while empty and returns once a name is added."""
+    async def run():
+        pending = PendingJoins()
+        waiter = asyncio.create_task(pending.wait())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        
+        pending.add("John")
+        await asyncio.wait_for(waiter, timeout=1)
+        
+        # Already non-empty: returns immediately
+        await asyncio.wait_for(pending.wait(), timeout=1)
+    
+    asyncio.run(run())
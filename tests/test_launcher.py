@@ -0,0 +1,25 @@
+"""
+Tests for the web launcher entry point (launcher.py)
+"""
+import socket
+
+from launcher import wait_for_port
+
+
+def test_wait_for_port_detects_listening_server():
+    """Test that a listening port is reported as ready."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        port = server.getsockname()[1]
+        
+        assert wait_for_port(port, timeout=1.0) is True
+
+
+def test_wait_for_port_times_out():
+    """Test that a closed port times out."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    
+    assert wait_for_port(port, timeout=0.2, interval=0.05) is False
@@ -132,6 +132,24 @@ async def test_message_history_limit(memory_db):
     assert user.messages[-1] == "Message 14"
 
 
+@pytest.mark.asyncio
+async def test_remember_event_updates_in_place(memory_db):
+    """Test that repeated events keep the nickname and merge background and history."""
+    await memory_db.remember_event("test_user", nickname="Nick", message="Grüße 👋", background={"pet": "dog"})
+    await memory_db.remember_event("test_user", like_inc=2, background={"city": "Berlin"})
+    
+    # A smaller history limit trims older messages on the next append
+    memory_db.per_user_history = 2
+    for i in range(3):
+        await memory_db.remember_event("test_user", message=f"Message {i}")
+    
+    user = await memory_db.get_user("test_user")
+    assert user.nickname == "Nick"
+    assert user.likes == 2
+    assert user.background == {"pet": "dog", "city": "Berlin"}
+    assert user.messages == ["Message 1", "Message 2"]
+
+
 @pytest.mark.asyncio
 async def test_background_info(memory_db):
     """Test background info generation."""
@@ -162,6 +180,20 @@ async def test_background_info_truncation(memory_db):
     assert "…" in info
 
 
+@pytest.mark.asyncio
+async def test_update_background_merges(memory_db):
+    """Test that extracted entities merge into background without a full rewrite."""
+    await memory_db.remember_event("test_user", nickname="Nick", like_inc=4, background={"pet": "dog"})
+    await memory_db.update_background("test_user", {"city": "Berlin"})
+    await memory_db.update_background("new_user", {"hobby": "chess"})
+    
+    user = await memory_db.get_user("test_user")
+    assert user.background == {"pet": "dog", "city": "Berlin"}
+    assert user.likes == 4
+    assert user.nickname == "Nick"
+    assert await memory_db.get_background_info("new_user") == "hobby=chess"
+
+
 @pytest.mark.asyncio
 async def test_clean_old_users(memory_db):
     """Test that old user data is removed."""
@@ -228,3 +260,255 @@ async def test_concurrent_access(memory_db):
     user = await memory_db.get_user("test_user")
     # Should have 30 likes total
     assert user.likes == 30
+
+
+@pytest.mark.asyncio
+async def test_memory_db_uses_wal(memory_db):
+    """Test that file databases run in WAL mode with the last_seen index."""
+    cursor = await memory_db._conn.execute("PRAGMA journal_mode")
+    assert (await cursor.fetchone())[0] == "wal"
+    
+    cursor = await memory_db._conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name = 'idx_users_last_seen'"
+    )
+    assert await cursor.fetchone() is not None
+
+
+@pytest.mark.asyncio
+async def test_remember_event_is_written_behind(memory_db):
+    """Test that events are coalesced in memory until flushed."""
+    for _ in range(5):
+        await memory_db.remember_event("test_user", nickname="Nick", like_inc=1)
+    
+    cursor = await memory_db._conn.execute("SELECT COUNT(*) FROM users")
+    assert (await cursor.fetchone())[0] == 0
+    assert memory_db._pending["test_user"].likes == 5
+    
+    await memory_db.flush()
+    assert not memory_db._pending
+    cursor = await memory_db._conn.execute("SELECT likes, nickname FROM users WHERE uid = ?", ("test_user",))
+    assert tuple(await cursor.fetchone()) == (5, "Nick")
+
+
+@pytest.mark.asyncio
+async def test_flush_loop_writes_pending_events(memory_db):
+    """Test that the background flusher commits without an explicit flush."""
+    memory_db.FLUSH_INTERVAL = 0.01
+    memory_db._flush_wake.set()
+    await memory_db.remember_event("test_user", like_inc=3)
+    
+    for _ in range(100):
+        if not memory_db._pending:
+            break
+        await asyncio.sleep(0.01)
+    
+    cursor = await memory_db._conn.execute("SELECT likes FROM users WHERE uid = ?", ("test_user",))
+    assert (await cursor.fetchone())[0] == 3
+
+
+@pytest.mark.asyncio
+async def test_messages_stored_in_history_table(memory_db):
+    """Test that history rows are trimmed to per_user_history on flush."""
+    for i in range(15):
+        await memory_db.remember_event("test_user", message=f"Message {i}")
+        await memory_db.flush()
+    
+    cursor = await memory_db._conn.execute("SELECT COUNT(*) FROM user_messages WHERE uid = ?", ("test_user",))
+    assert (await cursor.fetchone())[0] == 10
+    cursor = await memory_db._conn.execute("SELECT messages FROM users WHERE uid = ?", ("test_user",))
+    assert (await cursor.fetchone())[0] == "[]"
+
+
+@pytest.mark.asyncio
+async def test_legacy_messages_column_migrated():
+    """Test that histories kept in users.messages move to user_messages."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test_memory.db")
+        db = MemoryDB(db_path=db_path)
+        await db.initialize()
+        await db._conn.execute(
+            "INSERT INTO users (uid, first_seen, last_seen, messages) VALUES (?, ?, ?, ?)",
+            ("old_user", 1.0, time.time(), '["first", "second"]')
+        )
+        await db._conn.commit()
+        await db.close()
+        
+        db = MemoryDB(db_path=db_path)
+        await db.initialize()
+        user = await db.get_user("old_user")
+        await db.close()
+    
+    assert user.messages == ["first", "second"]
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_legacy_remember_event_debounces_saves(tmp_path, monkeypatch):
+    """Test that the legacy JSON path rewrites the file at most once per interval."""
+    import memory
+    from memory import flush_memory, remember_event
+    
+    path = tmp_path / "memory.json"
+    mem_cfg = {"file": str(path)}
+    mem = {"users": {}, "created": time.time()}
+    monkeypatch.setattr(memory, "_last_save", float("-inf"))
+    
+    remember_event(mem, mem_cfg, "u1", like_inc=1)
+    assert path.exists()
+    remember_event(mem, mem_cfg, "u1", like_inc=1, message="hi")
+    assert memory.json_loads(path.read_bytes())["users"]["u1"]["likes"] == 1
+    
+    flush_memory()
+    saved = memory.json_loads(path.read_bytes())["users"]["u1"]
+    assert saved["likes"] == 2
+    assert saved["messages"] == ["hi"]
+    assert memory._dirty is None
+
+
+@pytest.mark.asyncio
+async def test_extract_and_store_entities_uses_json_mode(memory_db):
+    """Test that extraction requests JSON mode and merges the parsed object."""
+    from types import SimpleNamespace
+    from memory import extract_and_store_entities
+    
+    calls = []
+    
+    async def create(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content='{"pet": "dog named Max"}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+    
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    await extract_and_store_entities("I have a dog named Max", "test_user", memory_db, client)
+    
+    assert calls[0]["response_format"] == {"type": "json_object"}
+    user = await memory_db.get_user("test_user")
+    assert user.background == {"pet": "dog named Max"}
+
+
+@pytest.mark.asyncio
+async def test_background_fmt_cached_and_backfilled():
+    """Test that background_fmt is added to old databases and kept current."""
+    import sqlite3
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test_memory.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE users (
+                uid TEXT PRIMARY KEY, first_seen REAL NOT NULL, last_seen REAL NOT NULL,
+                nickname TEXT DEFAULT '', likes INTEGER DEFAULT 0, gifts INTEGER DEFAULT 0,
+                follows INTEGER DEFAULT 0, subs INTEGER DEFAULT 0, shares INTEGER DEFAULT 0,
+                joins INTEGER DEFAULT 0, messages TEXT DEFAULT '[]', last_greet REAL DEFAULT 0.0,
+                background TEXT DEFAULT '{}'
+            )
+        """)
+        conn.execute(
+            "INSERT INTO users (uid, first_seen, last_seen, background) VALUES ('old_user', 1, 1, ?)",
+            ('{"pet": "cat"}',)
+        )
+        conn.commit()
+        conn.close()
+        
+        db = MemoryDB(db_path=db_path)
+        await db.initialize()
+        assert await db.get_background_info("old_user") == "pet=cat"
+        
+        await db.update_background("old_user", {"city": "Wien"})
+        user = await db.get_user("old_user")
+        user.background["pet"] = "dog"
+        await db.save_user(user)
+        assert await db.get_background_info("old_user") == "pet=dog, city=Wien"
+        assert await db.get_background_info("missing_user") == ""
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_get_user_matches_validated_model(memory_db):
+    """Test that unvalidated rows from get_user equal a fully validated UserModel."""
+    await memory_db.remember_event("test_user", nickname="Nick", like_inc=2, follow=True,
+                                   message="Hi", background={"pet": "dog"})
+    user = await memory_db.get_user("test_user")
+    
+    assert user == UserModel(**user.model_dump())
+    assert isinstance(user.first_seen, float)
+    assert isinstance(user.follows, int)
+
+
+@pytest.mark.asyncio
+async def test_close_keeps_batch_in_flight():
+    """Test that closing while the flush loop is writing does not drop its batch."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test_memory.db")
+        db = MemoryDB(db_path=db_path)
+        await db.initialize()
+        for i in range(50):
+            await db.remember_event(f"user_{i}", like_inc=1)
+        
+        # Wake the loop and let it swap the batch out of _pending before closing
+        db._flush_wake.set()
+        for _ in range(100):
+            if not db._pending:
+                break
+            await asyncio.sleep(0)
+        await db.close()
+        
+        db = MemoryDB(db_path=db_path)
+        await db.initialize()
+        assert await db.get_user_count() == 50
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_batch_for_retry(memory_db, monkeypatch):
+    """Test that a failed flush requeues its batch ahead of newer events."""
+    import sqlite3
+    
+    await memory_db.remember_event("test_user", nickname="Nick", like_inc=2, message="first")
+    
+    real_executemany = memory_db._conn.executemany
+    
+    async def locked(*args):
+        raise sqlite3.OperationalError("database is locked")
+    
+    async def broken_rollback():
+        raise sqlite3.OperationalError("cannot rollback")
+    
+    monkeypatch.setattr(memory_db._conn, "executemany", locked)
+    monkeypatch.setattr(memory_db._conn, "rollback", broken_rollback)
+    await memory_db.flush()
+    
+    assert memory_db._pending["test_user"].likes == 2
+    await memory_db.remember_event("test_user", like_inc=3, message="second")
+    
+    monkeypatch.setattr(memory_db._conn, "executemany", real_executemany)
+    user = await memory_db.get_user("test_user")
+    assert user.likes == 5
+    assert user.nickname == "Nick"
+    assert user.messages == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_flush_loop_survives_errors(memory_db, monkeypatch):
+    """Test that an exception from one flush does not end the background flusher."""
+    calls = []
+    real_flush = memory_db.flush
+    
+    async def flaky_flush():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        await real_flush()
+    
+    monkeypatch.setattr(memory_db, "flush", flaky_flush)
+    memory_db.FLUSH_INTERVAL = 0.01
+    await memory_db.remember_event("test_user", like_inc=1)
+    
+    for _ in range(200):
+        if len(calls) >= 2 and not memory_db._pending:
+            break
+        await asyncio.sleep(0.01)
+    
+    assert len(calls) >= 2
+    assert not memory_db._flush_task.done()
+    cursor = await memory_db._conn.execute("SELECT likes FROM users WHERE uid = ?", ("test_user",))
+    assert (await cursor.fetchone())[0] == 1
@@ -141,3 +141,33 @@ async def test_outbox_empty_text_ignored(mock_send_callback, mock_states):
     # Empty/whitespace messages should be ignored
     # Note: strip() in add() will make whitespace empty
     assert len(batcher.buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_outbox_add_many(mock_send_callback, mock_states):
+    """Test that add_many merges, orders and flushes like repeated add() calls."""
+    speech_state, mic_state = mock_states
+    
+    batcher = OutboxBatcher(
+        window_s=10,
+        max_items=3,
+        max_chars=1000,
+        sep=" ",
+        send_callback=mock_send_callback,
+        speech_state=speech_state,
+        mic_state=mic_state
+    )
+    
+    await batcher.add_many([
+        ("Alice followed", 2, "alice"),
+        ("Alice shared", 2, "alice"),
+        ("Bob sent Rose x1", 3, "bob"),
+        ("", 1, "carol"),
+        ("Dave followed", 2, "dave"),
+    ])
+    
+    # Alice's lines merge; the third distinct item triggers a flush
+    assert len(batcher.buffer) == 0
+    assert mock_send_callback.sent_messages == [
+        "Bob sent Rose x1 Alice followed Alice shared Dave followed"
+    ]
@@ -53,3 +53,58 @@ def test_settings_yaml_format():
         
         # Check that YAML file exists
         assert os.path.exists("settings.yaml")
+
+
+def test_load_settings_returns_isolated_copies(tmp_path):
+    """Test that cached settings are not shared between callers."""
+    os.chdir(tmp_path)
+    load_settings()
+    
+    first = load_settings()
+    first["animaze"]["host"] = "mutated"
+    
+    second = load_settings()
+    assert second["animaze"]["host"] != "mutated"
+
+
+def test_load_settings_uses_cache_until_file_changes(tmp_path, monkeypatch):
+    """Test that the settings file is only re-read after it changes."""
+    import settings as settings_module
+    
+    os.chdir(tmp_path)
+    load_settings()
+    load_settings()
+    
+    calls = []
+    real_parse = settings_module._parse_settings_yaml
+    
+    def counting_parse(raw):
+        calls.append(1)
+        return real_parse(raw)
+    
+    monkeypatch.setattr(settings_module, "_parse_settings_yaml", counting_parse)
+    
+    load_settings()
+    assert calls == []
+    
+    save_settings(load_settings())
+    load_settings()
+    assert calls == [1]
+
+
+def test_load_settings_reuses_binary_cache(tmp_path, monkeypatch):
+    """Test that unchanged settings content is loaded from the pickle cache."""
+    import settings as settings_module
+    
+    os.chdir(tmp_path)
+    load_settings()
+    expected = load_settings()
+    assert len(os.listdir(settings_module.SETTINGS_CACHE_DIR)) == 1
+    
+    def fail_load(*args, **kwargs):
+        raise AssertionError("YAML should not be parsed")
+    
+    monkeypatch.setattr(settings_module.yaml, "load", fail_load)
+    settings_module.invalidate_settings_cache()
+    
+    assert load_settings() == expected
@@ -2,7 +2,10 @@
 Tests for Phase 7: Utility Functions (utils.py)
 """
 import asyncio
-from utils import trim_text, TokenBucket, fuzzy_match, TokenBuffer
+import pytest
+import utils
+from collections import deque
+from utils import JSONDecodeError, json_dumpb, json_dumps, json_loads, trim_text, TokenBucket, fuzzy_match, TokenBuffer
 
 
 def test_trim_text_no_trim():
@@ -147,3 +150,34 @@ def test_token_buffer_clear():
     buffer.clear()
     
     assert len(buffer.messages) == 0
+
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+def test_json_roundtrip(monkeypatch, backend):
+    """Test that both JSON backends produce the same compact text."""
+    if backend == "json":
+        monkeypatch.setattr(utils, "orjson", None)
+    elif utils.orjson is None:
+        pytest.skip("orjson not installed")
+    data = {"messages": ["hallo ü", 'sagt "hi"'], "n": 3}
+    
+    text = json_dumps(data)
+    
+    assert isinstance(text, str)
+    assert text == '{"messages":["hallo ü","sagt \\"hi\\""],"n":3}'
+    assert json_loads(text) == data
+    assert json_loads(text.encode("utf-8")) == data
+    with pytest.raises(JSONDecodeError):
+        json_loads("{broken")
+
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+def test_json_dumpb_handles_deques_and_int_keys(monkeypatch, backend):
+    """Test that legacy memory structures serialize to the same bytes on both backends."""
+    if backend == "json":
+        monkeypatch.setattr(utils, "orjson", None)
+    elif utils.orjson is None:
+        pytest.skip("orjson not installed")
+    data = {"users": {"u1": {"messages": deque(["hi"], maxlen=10), "tags": {"ü"}}}, 1: 2}
+    
+    assert json_dumpb(data) == '{"users":{"u1":{"messages":["hi"],"tags":["ü"]}},"1":2}'.encode("utf-8")
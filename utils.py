@@ -3,12 +3,79 @@ Utility functions for text processing and general helpers.
 """
 
 import asyncio
+import json
 import time
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import Dict, Any, List, Optional, Union
 import logging
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional at runtime
+    orjson = None
+
 log = logging.getLogger("ChatPalUtils")
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so this catches both backends
+JSONDecodeError = json.JSONDecodeError
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse JSON, using orjson when it is installed.
+    
+    Args:
+        data: JSON document as str or bytes
+    
+    Returns:
+        Decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> str:
+    """
+    Serialize an object to a compact JSON string, using orjson when it is installed.
+    
+    Args:
+        obj: Object to serialize
+    
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode containers the JSON backends do not know, such as deques and sets."""
+    if isinstance(obj, (deque, set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumpb(obj: Any) -> bytes:
+    """
+    Serialize an object to compact UTF-8 JSON bytes for writing to disk.
+    
+    Non-string dict keys are converted to strings and deques or sets are
+    written as lists.
+    
+    Args:
+        obj: Object to serialize
+    
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=_json_default
+    ).encode("utf-8")
+
 
 def trim_text(text: str, max_length: int) -> str:
     """